@@ -1,109 +1,492 @@
 
 import pandas as pd
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+import config
 from datetime import datetime, timedelta
 from database import TransactionModel
+from database.rollup_model import CELL_FIELDS
+from utils import handler_datetime
+
+
+# shared by every analyzer in the process; pymongo clients are thread-safe
+_executor = ThreadPoolExecutor(
+    max_workers=config.ANALYZER_MAX_WORKERS,
+    thread_name_prefix="analyzer"
+)
+
+# spending heatmap columns, ISO weekdays 1..7
+WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def run_concurrently(tasks: dict) -> dict:
+    """Run independent callables on the analyzer pool, name -> result"""
+    # each task runs in a copy of the caller's context (query tracing, ...)
+    futures = {
+        name: _executor.submit(contextvars.copy_context().run, task)
+        for name, task in tasks.items()
+    }
+    return {name: future.result() for name, future in futures.items()}
+
+
+@dataclass
+class DashboardSnapshot:
+    """Every panel of the Home dashboard for one (user, date range)"""
+    total_expenses: float = 0
+    total_income: float = 0
+    daily_average: float = 0
+    category_spending: pd.DataFrame = field(default_factory=pd.DataFrame)
+    monthly_trend: pd.DataFrame = field(default_factory=pd.DataFrame)
+    spending_heatmap: pd.DataFrame = field(default_factory=pd.DataFrame)
+
+    @property
+    def net_balance(self) -> float:
+        return self.total_income - self.total_expenses
+
 
 class FinanceAnalyzer:
     def __init__(self, 
                  transaction_model: TransactionModel):
         self.transaction_model = transaction_model
     
-    def get_transactions_dataframe(self):
-        """Convert transactions to pandas DataFrame"""
-        transactions = self.transaction_model.get_transactions()
-        
-        if not transactions:
-            return pd.DataFrame()
-        
-        df = pd.DataFrame(transactions)
-        df['date'] = pd.to_datetime(df['date'])
-        return df
+    def get_transactions_dataframe(self, fields=None, advanced_filters=None):
+        """Load transactions as a typed pandas DataFrame (analysis columns by default)"""
+        return self.transaction_model.get_transactions_frame(
+            advanced_filters=advanced_filters,
+            fields=fields or TransactionModel.ANALYSIS_FIELDS
+        )
     
-    def calculate_total_by_type(self, transaction_type, start_date=None, end_date=None):
-        """Calculate total amount by transaction type"""
+    @staticmethod
+    def _date_filters(start_date=None, end_date=None) -> dict:
+        """Build advanced filters for a date range (both bounds required)"""
         if start_date and end_date:
-            transactions = self.transaction_model.get_transactions_by_date_range(
-                start_date, end_date
-            )
-        else:
-            transactions = self.transaction_model.get_transactions()
+            return {"start_date": start_date, "end_date": end_date}
+        return {}
+
+    # ======================================
+    # panel queries: (filters, pipeline) pairs
+    # shared by the single metric methods and the dashboard snapshot
+    # ======================================
+
+    def _totals_query(self, start_date=None, end_date=None):
+        """Total amount per transaction type"""
+        pipeline = [{"$group": {"_id": "$type", "total": {"$sum": "$amount"}}}]
+        return self._date_filters(start_date, end_date), pipeline
+
+    def _category_query(self, start_date=None, end_date=None):
+        """Expense total/count/average per category"""
+        filters = self._date_filters(start_date, end_date)
+        filters["transaction_type"] = "Expense"  # only expenses
+        pipeline = [
+            {"$group": {
+                "_id": "$category",
+                "total": {"$sum": "$amount"},
+                "count": {"$sum": 1},
+                "average": {"$avg": "$amount"}
+            }},
+            {"$sort": {"total": -1}}
+        ]
+        return filters, pipeline
+
+    @staticmethod
+    def _trend_range(months=6):
+        """(start, end) of the monthly trend window"""
+        end_date = datetime.now()
+        return end_date - timedelta(days=months*30), end_date
+
+    def _monthly_query(self, months=6):
+        """Amount per (month, type) over the last `months` months"""
+        start_date, end_date = self._trend_range(months)
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "month": {"$dateTrunc": {"date": "$date", "unit": "month"}},
+                    "type": "$type"
+                },
+                "total": {"$sum": "$amount"}
+            }}
+        ]
+        return self._date_filters(start_date, end_date), pipeline
+
+    def _daily_average_query(self):
+        """Expense total plus first/last expense date"""
+        pipeline = [
+            {"$group": {
+                "_id": None,
+                "total": {"$sum": "$amount"},
+                "first_date": {"$min": "$date"},
+                "last_date": {"$max": "$date"}
+            }}
+        ]
+        return {"transaction_type": "Expense"}, pipeline
+
+    def _heatmap_query(self, start_date=None, end_date=None):
+        """Expense total per (ISO year, ISO week, ISO weekday)"""
+        filters = self._date_filters(start_date, end_date)
+        filters["transaction_type"] = "Expense"
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "iso_year": {"$isoWeekYear": "$date"},
+                    "iso_week": {"$isoWeek": "$date"},
+                    "weekday": {"$isoDayOfWeek": "$date"} # 1 = Monday
+                },
+                "total": {"$sum": "$amount"}
+            }}
+        ]
+        return filters, pipeline
+
+    def _timeline_query(self, start_date=None, end_date=None):
+        """Smallest/largest amount and count per (day, type)"""
+        pipeline = [
+            {"$group": {
+                "_id": {
+                    "day": {"$dateTrunc": {"date": "$date", "unit": "day"}},
+                    "type": "$type"
+                },
+                "min": {"$min": "$amount"},
+                "max": {"$max": "$amount"},
+                "count": {"$sum": 1}
+            }}
+        ]
+        return self._date_filters(start_date, end_date), pipeline
+
+    def _run(self, query):
+        filters, pipeline = query
+        return self.transaction_model.aggregate(pipeline, filters)
+
+    # ======================================
+    # row -> result shape converters
+    # ======================================
+
+    @staticmethod
+    def _to_totals(rows) -> dict:
+        return {row["_id"]: row["total"] for row in rows}
+
+    @staticmethod
+    def _to_category_spending(rows) -> pd.DataFrame:
+        if not rows:
+            return pd.DataFrame()
         
-        total = sum(t['amount'] for t in transactions if t['type'] == transaction_type)
-        return total
-    
-    def get_spending_by_category(self, start_date=None, end_date=None):
-        """Get spending grouped by category"""
-        if start_date and end_date:
-            transactions = self.transaction_model.get_transactions_by_date_range(
-                start_date, end_date
-            )
-        else:
-            transactions = self.transaction_model.get_transactions()
+        category_spending = pd.DataFrame(rows)[['_id', 'total', 'count', 'average']]
+        category_spending.columns = ['Category', 'Total', 'Count', 'Average']
+        return category_spending
+
+    @staticmethod
+    def _to_monthly_trend(rows) -> pd.DataFrame:
+        if not rows:
+            return pd.DataFrame()
         
-        df = pd.DataFrame(transactions)
+        df = pd.DataFrame([
+            {"month": row["_id"]["month"], "type": row["_id"]["type"], "amount": row["total"]}
+            for row in rows
+        ])
+        df['month'] = pd.to_datetime(df['month'])
         
-        if df.empty:
+        return df.pivot_table(
+            index='month', columns='type', values='amount', aggfunc='sum', fill_value=0
+        ).sort_index()
+
+    @staticmethod
+    def _to_spending_heatmap(rows) -> pd.DataFrame:
+        """
+        Week x weekday grid from heatmap rows: one row per ISO week
+        ("2025-W07") from the first to the last week, Monday..Sunday columns.
+        """
+        if not rows:
             return pd.DataFrame()
+
+        cells = pd.DataFrame([{**row["_id"], "total": row["total"]} for row in rows])
+        cells['week'] = pd.to_datetime(
+            cells['iso_year'].astype(str) + "-W" + cells['iso_week'].astype(str).str.zfill(2) + "-1",
+            format="%G-W%V-%u"
+        )
+        grid = cells.pivot_table(index='week', columns='weekday', values='total', aggfunc='sum', fill_value=0)
+
+        # weeks without expenses are shown too, so the rows stay evenly spaced
+        weeks = pd.date_range(grid.index.min(), grid.index.max(), freq='W-MON')
+        grid = grid.reindex(index=weeks, columns=range(1, 8), fill_value=0)
+        grid.index = weeks.strftime("%G-W%V")
+        grid.columns = WEEKDAYS
+        return grid
+
+    @staticmethod
+    def _frame_to_heatmap_rows(df: pd.DataFrame) -> list[dict]:
+        """Heatmap rows (same shape as _heatmap_query's) binned from a date/amount frame"""
+        if df.empty:
+            return []
+
+        iso = df['date'].dt.isocalendar() # integer year/week/day columns
+        totals = df['amount'].groupby([iso['year'], iso['week'], iso['day']]).sum()
+        return [
+            {"_id": {"iso_year": int(year), "iso_week": int(week), "weekday": int(day)}, "total": total}
+            for (year, week, day), total in totals.items()
+        ]
+
+    @staticmethod
+    def _to_timeline_overview(rows) -> pd.DataFrame:
+        """
+        Timeline points from the per-day rows: the day's largest and
+        smallest amount (one point when they are equal), with the
+        timeline's columns so the same chart draws both.
+        """
+        points = []
+        for row in rows:
+            day, transaction_type = row["_id"]["day"], row["_id"]["type"]
+            summary = f"{row['count']} transaction(s) that day"
+            points.append({"date": day, "type": transaction_type, "amount": row["max"],
+                           "category": "largest of the day", "description": summary})
+            if row["min"] != row["max"]:
+                points.append({"date": day, "type": transaction_type, "amount": row["min"],
+                               "category": "smallest of the day", "description": summary})
+
+        columns = ["date", *TransactionModel.LIST_FIELDS[1:]]
+        return pd.DataFrame(points, columns=columns).sort_values("date", ignore_index=True)
+
+    @staticmethod
+    def _to_daily_average(rows) -> float:
+        if not rows:
+            return 0
         
-        # Filter only expenses
-        expenses = df[df['type'] == 'Expense']
+        row = rows[0]
+        date_range = (row['last_date'] - row['first_date']).days + 1
+        total_spending = row['total']
         
+        return total_spending / date_range if date_range > 0 else 0
+
+    # ======================================
+    # rollup read path: same results from pre-aggregated cells
+    # ======================================
+
+    def _rollup_cells(self, start_date=None, end_date=None):
+        """
+        Rollup cells for the range as a DataFrame, or None when the user's
+        rollups are not complete yet (callers then use the raw pipelines).
+        """
+        rollup_model = self.transaction_model.rollup_model
+        user_id = self.transaction_model.user_id
+        if not rollup_model.is_ready(user_id):
+            return None
+
+        # same rule as _date_filters: a range needs both bounds
+        if start_date and end_date:
+            start_date, end_date = handler_datetime(start_date), handler_datetime(end_date)
+        else:
+            start_date = end_date = None
+
+        cells = rollup_model.get_cells(user_id, start_date, end_date)
+        return pd.DataFrame(cells, columns=CELL_FIELDS)
+
+    @staticmethod
+    def _cells_to_totals(cells: pd.DataFrame) -> dict:
+        return cells.groupby('type')['sum'].sum().to_dict()
+
+    @staticmethod
+    def _cells_to_category_spending(cells: pd.DataFrame) -> pd.DataFrame:
+        expenses = cells[cells['type'] == 'Expense']
         if expenses.empty:
             return pd.DataFrame()
-        
-        category_spending = expenses.groupby('category')['amount'].agg(['sum', 'count', 'mean']).reset_index()
-        category_spending.columns = ['Category', 'Total', 'Count', 'Average']
-        category_spending = category_spending.sort_values('Total', ascending=False)
-        
-        return category_spending
+
+        category_spending = expenses.groupby('category')[['sum', 'count']].sum().reset_index()
+        category_spending.columns = ['Category', 'Total', 'Count']
+        category_spending['Average'] = category_spending['Total'] / category_spending['Count']
+        return category_spending.sort_values('Total', ascending=False).reset_index(drop=True)
+
+    @staticmethod
+    def _cells_to_monthly_trend(cells: pd.DataFrame) -> pd.DataFrame:
+        if cells.empty:
+            return pd.DataFrame()
+
+        df = pd.DataFrame({
+            'month': pd.to_datetime(cells['bucket']).dt.to_period('M').dt.to_timestamp(),
+            'type': cells['type'],
+            'amount': cells['sum'],
+        })
+        return df.pivot_table(
+            index='month', columns='type', values='amount', aggfunc='sum', fill_value=0
+        ).sort_index()
+
+    def _expense_date_bounds(self):
+        """
+        First/last expense date from the transactions (two indexed
+        find_one): the cells' first_date/last_date only widen, so they go
+        stale once the first or last expense is deleted.
+        """
+        return self.transaction_model.get_date_bounds({"transaction_type": "Expense"})
+
+    @staticmethod
+    def _cells_to_daily_average(cells: pd.DataFrame, bounds) -> float:
+        first_date, last_date = bounds
+        expenses = cells[cells['type'] == 'Expense']
+        if expenses.empty or first_date is None:
+            return 0
+
+        date_range = (last_date - first_date).days + 1
+        total_spending = expenses['sum'].sum()
+
+        return total_spending / date_range if date_range > 0 else 0
+
+    # ======================================
+    # public metrics
+    # ======================================
+
+    def calculate_total_by_type(self, transaction_type, start_date=None, end_date=None):
+        """Calculate total amount by transaction type"""
+        cells = self._rollup_cells(start_date, end_date)
+        if cells is not None:
+            return self._cells_to_totals(cells).get(transaction_type, 0)
+
+        filters = self._date_filters(start_date, end_date)
+        filters["transaction_type"] = transaction_type
+
+        # let mongo sum the amounts, only one row comes back
+        rows = self.transaction_model.aggregate(
+            [{"$group": {"_id": None, "total": {"$sum": "$amount"}}}],
+            filters
+        )
+        return rows[0]["total"] if rows else 0
+    
+    def get_spending_by_category(self, start_date=None, end_date=None):
+        """Get spending grouped by category"""
+        cells = self._rollup_cells(start_date, end_date)
+        if cells is not None:
+            return self._cells_to_category_spending(cells)
+        return self._to_category_spending(self._run(self._category_query(start_date, end_date)))
     
     def get_monthly_trend(self, months=6):
         """Get monthly spending and income trend"""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=months*30)
-        
-        transactions = self.transaction_model.get_transactions_by_date_range(
-            start_date, end_date
-        )
-        
-        df = pd.DataFrame(transactions)
-        
-        if df.empty:
-            return pd.DataFrame()
-        
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.to_period('M')
-        
-        monthly_data = df.groupby(['month', 'type'])['amount'].sum().unstack(fill_value=0)
-        monthly_data.index = monthly_data.index.to_timestamp()
-        
-        return monthly_data
+        cells = self._rollup_cells(*self._trend_range(months))
+        if cells is not None:
+            return self._cells_to_monthly_trend(cells)
+        return self._to_monthly_trend(self._run(self._monthly_query(months)))
     
     def get_daily_average(self):
         """Calculate daily average spending"""
+        cells = self._rollup_cells()
+        if cells is not None:
+            return self._cells_to_daily_average(cells, self._expense_date_bounds())
+        return self._to_daily_average(self._run(self._daily_average_query()))
 
-        # approach 1:
-        transactions = self.transaction_model.get_transactions()
-        expenses = [t for t in transactions if t['type'] == 'Expense']
+    def get_date_bounds(self, start_date=None, end_date=None):
+        """(first, last) transaction date in the range, (None, None) if empty"""
+        return self.transaction_model.get_date_bounds(self._date_filters(start_date, end_date))
 
-        # # approach 2:
-        # advanced_filter = {"type": 'Expense'}
-        # expenses = self.transaction_model.get_transactions(advanced_filter)
+    def get_timeline(self, start_date=None, end_date=None, max_points=config.TIMELINE_MAX_POINTS):
+        """
+        Transactions for the timeline chart.
 
-        if not expenses:
-            return 0
-        
-        df = pd.DataFrame(expenses)
-        df['date'] = pd.to_datetime(df['date']) # ensure convert properly datetime format
-        
-        date_range = (df['date'].max() - df['date'].min()).days + 1
-        total_spending = df['amount'].sum()
-        
-        return total_spending / date_range if date_range > 0 else 0
+        Ranges holding at most `max_points` transactions are loaded at
+        full resolution; longer ones come back as per-day min/max points
+        grouped by MongoDB, so no raw rows of a long history are read.
+
+        Returns:
+            (DataFrame with the LIST_FIELDS columns, True if full resolution)
+        """
+        filters = self._date_filters(start_date, end_date)
+        if self.transaction_model.count_transactions(filters) <= max_points:
+            return self.get_transactions_dataframe(fields=TransactionModel.LIST_FIELDS,
+                                                   advanced_filters=filters), True
+        return self._to_timeline_overview(self._run(self._timeline_query(start_date, end_date))), False
+
+    def get_spending_heatmap(self, start_date=None, end_date=None) -> pd.DataFrame:
+        """
+        Expenses per ISO week and weekday (see _to_spending_heatmap).
+
+        Binned by MongoDB so only one row per (week, weekday) is read, or,
+        with config.HEATMAP_SERVER_BINNING off, from the date/amount
+        columns in pandas.
+        """
+        if config.HEATMAP_SERVER_BINNING:
+            return self._to_spending_heatmap(self._run(self._heatmap_query(start_date, end_date)))
+
+        filters = self._date_filters(start_date, end_date)
+        filters["transaction_type"] = "Expense"
+        df = self.get_transactions_dataframe(fields=["date", "amount"], advanced_filters=filters)
+        return self._to_spending_heatmap(self._frame_to_heatmap_rows(df))
+
+    def get_dashboard_snapshot(self, start_date=None, end_date=None, months=6) -> "DashboardSnapshot":
+        """
+        Compute every dashboard panel for one (user, date range).
+
+        The panels are independent queries: they run concurrently on the
+        shared client (config.DASHBOARD_PARALLEL_QUERIES), so the page waits
+        for the slowest one only, or as branches of one $facet stage when
+        parallel queries are disabled. Users with complete rollups are
+        served from the rollup cells instead of raw transactions.
+
+        Args:
+            start_date: Start of the metrics/category range (optional)
+            end_date: End of the metrics/category range (optional)
+            months: Number of months covered by the trend panel
+
+        Returns:
+            DashboardSnapshot with every panel's data
+        """
+        if self.transaction_model.rollup_model.is_ready(self.transaction_model.user_id):
+            return self._snapshot_from_rollups(start_date, end_date, months)
+
+        queries = {
+            "totals": self._totals_query(start_date, end_date),
+            "categories": self._category_query(start_date, end_date),
+            "monthly": self._monthly_query(months),
+            "daily": self._daily_average_query(),
+        }
+        if config.HEATMAP_SERVER_BINNING:
+            queries["heatmap"] = self._heatmap_query(start_date, end_date)
+
+        if config.DASHBOARD_PARALLEL_QUERIES:
+            result = run_concurrently({name: partial(self._run, query) for name, query in queries.items()})
+        else:
+            result = self.transaction_model.aggregate_facets(queries)
+
+        if config.HEATMAP_SERVER_BINNING:
+            spending_heatmap = self._to_spending_heatmap(result["heatmap"])
+        else:
+            spending_heatmap = self.get_spending_heatmap(start_date, end_date)
+
+        totals = self._to_totals(result["totals"])
+        return DashboardSnapshot(
+            total_expenses=totals.get("Expense", 0),
+            total_income=totals.get("Income", 0),
+            daily_average=self._to_daily_average(result["daily"]),
+            category_spending=self._to_category_spending(result["categories"]),
+            monthly_trend=self._to_monthly_trend(result["monthly"]),
+            spending_heatmap=spending_heatmap,
+        )
+
+    def _snapshot_from_rollups(self, start_date, end_date, months) -> "DashboardSnapshot":
+        """DashboardSnapshot from rollup cells (up to three concurrent cell queries)"""
+        tasks = {
+            "all_time": self._rollup_cells,
+            "trend": partial(self._rollup_cells, *self._trend_range(months)),
+            # month cells cannot be split into weekdays, binned from transactions
+            "heatmap": partial(self.get_spending_heatmap, start_date, end_date),
+            "expense_bounds": self._expense_date_bounds,
+        }
+        if start_date and end_date:
+            tasks["range"] = partial(self._rollup_cells, start_date, end_date)
+
+        cells = run_concurrently(tasks)
+        range_cells = cells.get("range", cells["all_time"])
+
+        totals = self._cells_to_totals(range_cells)
+        return DashboardSnapshot(
+            total_expenses=totals.get("Expense", 0),
+            total_income=totals.get("Income", 0),
+            daily_average=self._cells_to_daily_average(cells["all_time"], cells["expense_bounds"]),
+            category_spending=self._cells_to_category_spending(range_cells),
+            monthly_trend=self._cells_to_monthly_trend(cells["trend"]),
+            spending_heatmap=cells["heatmap"],
+        )
     
     def detect_anomalies(self, threshold=2):
         """Detect unusual spending patterns"""
-        df = self.get_transactions_dataframe()
+        df = self.get_transactions_dataframe(
+            fields=[*TransactionModel.ANALYSIS_FIELDS, 'description'],
+            advanced_filters={"transaction_type": "Expense"}
+        )
         
         if df.empty:
             return pd.DataFrame()
@@ -140,25 +523,60 @@ class FinanceAnalyzer:
     
     def get_statistics_summary(self):
         """Get comprehensive statistics summary"""
-        df = self.get_transactions_dataframe()
+        rows = self.transaction_model.aggregate(
+            [
+                {"$group": {
+                    "_id": "$type",
+                    "total": {"$sum": "$amount"},
+                    "average": {"$avg": "$amount"},
+                    "count": {"$sum": 1}
+                }}
+            ]
+        )
         
-        if df.empty:
+        if not rows:
             return {}
         
-        expenses = df[df['type'] == 'Expense']
-        income = df[df['type'] == 'Income']
+        by_type = {row['_id']: row for row in rows}
+        expenses = by_type.get('Expense', {})
+        income = by_type.get('Income', {})
         
         summary = {
-            'total_expenses': expenses['amount'].sum() if not expenses.empty else 0,
-            'total_income': income['amount'].sum() if not income.empty else 0,
-            'avg_expense': expenses['amount'].mean() if not expenses.empty else 0,
-            'avg_income': income['amount'].mean() if not income.empty else 0,
-            'median_expense': expenses['amount'].median() if not expenses.empty else 0,
-            'transaction_count': len(df),
-            'expense_count': len(expenses),
-            'income_count': len(income),
+            'total_expenses': expenses.get('total', 0),
+            'total_income': income.get('total', 0),
+            'avg_expense': expenses.get('average', 0),
+            'avg_income': income.get('average', 0),
+            'median_expense': self._median_expense(expenses.get('count', 0)),
+            'transaction_count': sum(row['count'] for row in rows),
+            'expense_count': expenses.get('count', 0),
+            'income_count': income.get('count', 0),
         }
         
         summary['net_balance'] = summary['total_income'] - summary['total_expenses']
         
         return summary
+
+    def _median_expense(self, count: int) -> float:
+        """
+        Exact median expense amount ($median needs MongoDB 7.0, this works on 5.0).
+
+        Only the middle one or two amounts leave the server: sort, skip to
+        the middle, limit 2.
+
+        Args:
+            count: number of expenses (from the summary $group)
+        """
+        if not count:
+            return 0
+        middle = self.transaction_model.aggregate(
+            [
+                {"$sort": {"amount": 1}},
+                {"$skip": (count - 1) // 2},
+                {"$limit": 2 - count % 2},
+                {"$project": {"_id": 0, "amount": 1}}
+            ],
+            {"transaction_type": "Expense"}
+        )
+        if not middle:
+            return 0
+        return sum(row['amount'] for row in middle) / len(middle)
@@ -1,25 +1,191 @@
 
 """
-pip install seaborn plotly
+pip install plotly
+
+Plotly is imported on the first chart, not when the app starts, so the
+login screen does not wait for it.
 """
+from collections import OrderedDict
+from functools import cache, wraps
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+@cache
+def _px():
+    import plotly.express as px
+    return px
+
+
+@cache
+def _go():
+    import plotly.graph_objects as go
+    return go
+
+
+def frame_fingerprint(data) -> str:
+    """Cheap content hash of a DataFrame/Series (values, index, columns, dtypes)"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(data, index=True).values.tobytes())
+    if isinstance(data, pd.DataFrame):
+        digest.update(repr(list(data.columns)).encode())
+        digest.update(repr(list(data.dtypes)).encode())
+    else:
+        digest.update(repr((data.name, data.dtype)).encode())
+    return digest.hexdigest()
+
+
+class FigureCache:
+    """
+    Bounded LRU of built figures, shared by every session in the process.
+
+    Keys are content hashes, so an entry is reused whenever a chart gets
+    the same data again and never has to be invalidated.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict() # key -> figure
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(key) # mark as recently used
+            return self._entries[key]
+
+    def put(self, key, figure):
+        with self._lock:
+            self._entries[key] = figure
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+figure_cache = FigureCache(max_entries=config.FIGURE_CACHE_MAX_ENTRIES)
+
+
+def cached_figure(builder):
+    """
+    Memoize a figure builder on the content of its arguments.
+
+    Meant for the aggregated inputs of the dashboard (a few hundred rows
+    at most): a frame longer than config.FIGURE_CACHE_MAX_ROWS is not
+    hashed and the figure is simply built.
+
+    The returned figure is shared between reruns and sessions: copy it
+    (go.Figure(fig)) before changing it.
+    """
+    @wraps(builder)
+    def wrapper(*args, **kwargs):
+        frames = [value for value in (*args, *kwargs.values()) if isinstance(value, (pd.DataFrame, pd.Series))]
+        if any(len(frame) > config.FIGURE_CACHE_MAX_ROWS for frame in frames):
+            return builder(*args, **kwargs)
+
+        def token(value):
+            if isinstance(value, (pd.DataFrame, pd.Series)):
+                return frame_fingerprint(value)
+            return repr(value)
+
+        key = (
+            builder.__qualname__,
+            tuple(token(arg) for arg in args),
+            tuple(sorted((name, token(value)) for name, value in kwargs.items()))
+        )
+        figure = figure_cache.get(key)
+        if figure is None:
+            figure = builder(*args, **kwargs)
+            if figure is not None:
+                figure_cache.put(key, figure)
+        return figure
+
+    return wrapper
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: positions of the `threshold` points
+    that best keep the shape (peaks and dips) of the series.
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import plotly.express as px
-import plotly.graph_objects as go
+    Args:
+        x: sorted x values as numbers
+        y: y values
+        threshold: number of points to keep
+
+    Returns:
+        sorted positions into x/y (all of them if the series is short enough)
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # first and last points are always kept, the rest is split in buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+
+        # average of the next bucket (the last point for the last bucket)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_x = x[end:next_end].mean()
+        next_y = y[end:next_end].mean()
+
+        # keep the point making the largest triangle with the anchor and that average
+        areas = np.abs(
+            (x[anchor] - next_x) * (y[start:end] - y[anchor])
+            - (x[anchor] - x[start:end]) * (next_y - y[anchor])
+        )
+        anchor = start + int(areas.argmax())
+        selected[bucket + 1] = anchor
+
+    return selected
+
+
+def downsample_timeline(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    At most `max_points` transactions, shared between the types and
+    picked with LTTB on (date, amount) so the spikes stay visible.
+    """
+    per_type = max(max_points // max(df['type'].nunique(), 1), 3)
+    parts = []
+    for _, group in df.sort_values('date').groupby('type', observed=True):
+        seconds = group['date'].to_numpy(dtype='datetime64[s]').astype(np.int64).astype(float)
+        keep = lttb_indices(seconds, group['amount'].to_numpy(dtype=float), per_type)
+        parts.append(group.iloc[keep])
+    return pd.concat(parts)
 
-# Set common style
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (10, 6)
 
 class FinanceVisualizer:
     
     @staticmethod
+    @cached_figure
     def plot_category_spending(category_data):
         """Create bar chart for spending by category"""
         if category_data.empty:
             return None
         
+        px = _px()
         fig = px.bar(
             category_data,
             x='Category',
@@ -39,11 +205,13 @@ class FinanceVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def plot_pie_chart(category_data):
         """Create pie chart for category distribution"""
         if category_data.empty:
             return  # early exist
         
+        px = _px()
         fig = px.pie(
             category_data,
             values='Total',
@@ -57,11 +225,13 @@ class FinanceVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def plot_monthly_trend(monthly_data):
         """Create line chart for monthly trend"""
         if monthly_data.empty:
             return None
         
+        go = _go()
         fig = go.Figure()
         
         if 'Expense' in monthly_data.columns:
@@ -93,6 +263,7 @@ class FinanceVisualizer:
         return fig
     
     @staticmethod
+    @cached_figure
     def plot_budget_comparison(budget_data, actual_data):
         """Create comparison chart for budget vs actual"""
         if budget_data.empty:
@@ -106,6 +277,7 @@ class FinanceVisualizer:
             how='left'
         ).fillna(0)
         
+        go = _go()
         fig = go.Figure()
         
         fig.add_trace(go.Bar(
@@ -133,25 +305,18 @@ class FinanceVisualizer:
         return fig
     
     @staticmethod
-    def plot_daily_spending_heatmap(df):
-        """Create heatmap for spending by day of week and hour"""
-        if df.empty:
-            return None
-        
-        expenses = df[df['type'] == 'Expense'].copy()
-        
-        if expenses.empty:
+    @cached_figure
+    def plot_daily_spending_heatmap(heatmap_data):
+        """
+        Create heatmap for spending by week and day of week
+
+        Args:
+            heatmap_data: week x weekday grid from FinanceAnalyzer.get_spending_heatmap
+        """
+        if heatmap_data.empty:
             return None
         
-        expenses['day_of_week'] = expenses['date'].dt.day_name()
-        expenses['week'] = expenses['date'].dt.isocalendar().week
-        
-        heatmap_data = expenses.groupby(['week', 'day_of_week'])['amount'].sum().unstack(fill_value=0)
-        
-        # Reorder days
-        days_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        heatmap_data = heatmap_data.reindex(columns=days_order, fill_value=0)
-        
+        px = _px()
         fig = px.imshow(
             heatmap_data,
             labels=dict(x="Day of Week", y="Week", color="Amount ($)"),
@@ -163,22 +328,42 @@ class FinanceVisualizer:
         return fig
     
     @staticmethod
-    def plot_transaction_timeline(df):
-        """Create timeline of transactions"""
+    @cached_figure
+    def plot_transaction_timeline(df, max_points: int = config.TIMELINE_MAX_POINTS,
+                                  full_resolution: bool = True):
+        """
+        Create timeline of transactions (WebGL scatter).
+
+        More than `max_points` points are downsampled with LTTB per type,
+        so the payload stays the same size however long the history is.
+        `full_resolution=False` marks per-day min/max points
+        (FinanceAnalyzer.get_timeline) in the title.
+        """
         if df.empty:
             return None
-        
-        fig = px.scatter(
-            df,
-            x='date',
-            y='amount',
-            color='type',
-            size='amount',
-            hover_data=['category', 'description'],
-            title='Transaction Timeline',
-            color_discrete_map={'Expense': 'red', 'Income': 'green'}
-        )
-        
-        fig.update_layout(height=500)
-        
+
+        shown = downsample_timeline(df, max_points)
+        colors = {'Expense': 'red', 'Income': 'green'}
+
+        go = _go()
+        fig = go.Figure()
+        for transaction_type, group in shown.groupby('type', observed=True):
+            hover = group.reindex(columns=['category', 'description']).fillna("")
+            fig.add_trace(go.Scattergl(
+                x=group['date'],
+                y=group['amount'],
+                mode='markers',
+                name=str(transaction_type),
+                marker=dict(color=colors.get(transaction_type), size=6, opacity=0.7),
+                customdata=hover.astype(str).to_numpy(),
+                hovertemplate="%{x|%Y-%m-%d %H:%M}<br>$%{y:,.2f}<br>%{customdata[0]}<br>%{customdata[1]}<extra></extra>"
+            ))
+
+        title = 'Transaction Timeline'
+        if not full_resolution:
+            title += ' (daily largest/smallest, zoom in for every transaction)'
+        elif len(shown) < len(df):
+            title += f' ({len(shown):,} of {len(df):,} transactions, zoom in for all)'
+        fig.update_layout(title=title, xaxis_title='Date', yaxis_title='Amount ($)', height=500)
+
         return fig
@@ -6,8 +6,11 @@ from database import (
     CategoryModel,
     TransactionModel,
     UserModel,
+    BudgetModel,
 )
 
+from database.query_monitor import query_monitor
+
 # import analytics
 from analytics.analyzer import FinanceAnalyzer
 from analytics.visualize import FinanceVisualizer
@@ -17,27 +20,48 @@ from views import (
     render_categories,
     render_transactions,
     render_user_profile,
-    render_dashboard
+    render_dashboard,
+    render_budgets,
+    render_query_debug
 )
 
 # initialize models
 @st.cache_resource
 def init_models():
-    """Initialize and cached models"""
+    """
+    Initialize and cache the shared models (one set per process).
+
+    They are never bound to a user: every session works on its own
+    handles from `user_models`, so sessions can run concurrently.
+    """
     return {
         "category": CategoryModel(),
         "transaction": TransactionModel(),
         "user": UserModel(),
+        "budget": BudgetModel(),
         "visualizer": FinanceVisualizer()
     }
 
-# initialize session per user
-if "models" not in st.session_state:
-    # initialize models
-    st.session_state['models'] = init_models()
+
+def user_models(shared_models: dict, user_id: str) -> dict:
+    """Models scoped to `user_id`, created once per session"""
+    session_models = st.session_state.get('models')
+    if session_models is None or session_models['user_id'] != user_id:
+        session_models = {
+            **shared_models,
+            "user_id": user_id,
+            "category": shared_models['category'].for_user(user_id),
+            "transaction": shared_models['transaction'].for_user(user_id),
+            "budget": shared_models['budget'].for_user(user_id),
+        }
+        st.session_state['models'] = session_models
+    return session_models
 
 
-models = st.session_state['models']
+models = init_models()
+
+# every MongoDB command of this rerun, for the debug panel
+queries = query_monitor.start_trace()
 
 # Page configuration
 st.set_page_config(
@@ -61,17 +85,19 @@ if not st.user.is_logged_in:
 else:
     # Get mongo_user
     user_model: UserModel = models['user']
-    try:
-        mongo_user_id = user_model.login(st.user.email)
-    except Exception as e:
-        st.error(f"Error during user login: {e}")
-        st.stop()
+    # look the user up once per session, not on every rerun
+    if st.session_state.get('login_email') != st.user.email:
+        try:
+            st.session_state['mongo_user_id'] = user_model.login(st.user.email)
+        except Exception as e:
+            st.error(f"Error during user login: {e}")
+            st.stop()
+        st.session_state['login_email'] = st.user.email
+
+    mongo_user_id = st.session_state['mongo_user_id']
 
-    # set user_id for models
-    # currently we have category and transaction models
-    # you can optimize this by doing it in the model init function
-    models['category'].set_user_id(mongo_user_id)
-    models['transaction'].set_user_id(mongo_user_id)
+    # handles scoped to this user, the shared models are never mutated
+    models = user_models(models, mongo_user_id)
 
 
     user = st.user.to_dict() # convert google_user to dict
@@ -83,7 +109,7 @@ else:
     render_user_profile(user_model, user)
 
     # init analyzer
-    # because transaction_model has set user_id already in line 74
+    # transaction_model is already scoped to the current user
     analyzer_model = FinanceAnalyzer(models['transaction'])
 
     # =============================================
@@ -92,7 +118,7 @@ else:
 
     page = st.sidebar.radio(
         "Navigation",
-        ["Home", "Category", "Transaction"]
+        ["Home", "Category", "Transaction", "Budget"]
     )
 
     # =============================================
@@ -119,3 +145,12 @@ else:
         # display transaction views
         render_transactions(transaction_model=transaction_model, category_model=category_model)
 
+    elif page == "Budget":
+        # display budget views
+        render_budgets(budget_model=models['budget'],
+                       category_model=models['category'],
+                       visualizer_model=models["visualizer"])
+
+    # per-rerun query breakdown (QUERY_DEBUG_PANEL=1)
+    if config.QUERY_DEBUG_PANEL:
+        render_query_debug(queries)
@@ -0,0 +1,111 @@
+"""
+Deterministic synthetic data for the benchmarks: N users x M transactions.
+
+The same seed always gives the same users, categories, amounts, dates and
+descriptions (dates are laid out backwards from `anchor`).
+"""
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+import config
+
+# words used to build descriptions, so keyword search has something to match
+DESCRIPTION_WORDS = [
+    "coffee", "lunch", "dinner", "grocery", "market", "uber", "taxi", "rent",
+    "netflix", "spotify", "gym", "pharmacy", "book", "gift", "salary", "bonus",
+    "refund", "fuel", "parking", "cinema", "pizza", "bakery", "amazon", "repair",
+]
+
+
+@dataclass
+class GeneratedUser:
+    user_id: str
+    email: str
+    transactions: int
+
+
+def user_email(index: int) -> str:
+    return f"bench-user-{index}@example.com"
+
+
+def generate_transactions(rng: random.Random, count: int, anchor: datetime, days: int) -> list[dict]:
+    """`count` transactions spread over the `days` days before `anchor`"""
+    transactions = []
+    for _ in range(count):
+        # roughly one income for every nine expenses
+        if rng.random() < 0.1:
+            transaction_type = "Income"
+            category = rng.choice(config.DEFAULT_CATEGORIES_INCOME)
+            amount = round(rng.uniform(200, 3000), 2)
+        else:
+            transaction_type = "Expense"
+            category = rng.choice(config.DEFAULT_CATEGORIES_EXPENSE)
+            amount = round(rng.lognormvariate(3, 1), 2) + 0.01
+
+        transactions.append({
+            "type": transaction_type,
+            "category": category,
+            "amount": amount,
+            "date": anchor - timedelta(seconds=rng.randrange(days * 24 * 3600)),
+            "description": " ".join(rng.sample(DESCRIPTION_WORDS, rng.randint(1, 3))),
+        })
+    return transactions
+
+
+def generate(
+    users: int,
+    transactions_per_user: int,
+    seed: int = 42,
+    anchor: datetime | None = None,
+    days: int = 365,
+    chunk_size: int = config.IMPORT_CHUNK_SIZE
+) -> list[GeneratedUser]:
+    """
+    (Re)create `users` benchmark users with `transactions_per_user` each.
+
+    Data is written through the models (insert_transactions), so rollups
+    and budget alerts are maintained exactly as in the app. Existing
+    benchmark users are deleted first.
+
+    Args:
+        users: number of users
+        transactions_per_user: transactions per user
+        seed: random seed, same seed -> same data
+        anchor: newest possible transaction date, default: end of today
+        days: history length in days
+        chunk_size: transactions per insert_many
+    """
+    # imported here so the caller can point MONGO_URI at the benchmark db first
+    from database import BudgetModel, TransactionModel, UserModel
+
+    anchor = anchor or datetime.combine(datetime.now().date(), datetime.max.time())
+    user_model = UserModel()
+    transaction_model = TransactionModel()
+    budget_model = BudgetModel()
+
+    generated = []
+    for index in range(users):
+        rng = random.Random(f"{seed}-{index}")
+        email = user_email(index)
+
+        existing = user_model.collection.find_one({"email": email}, {"_id": 1})
+        if existing:
+            user_model.delete_user_and_data(str(existing["_id"]))
+        user_id = user_model.login(email)
+
+        # provisions the default categories
+        scoped_transactions = transaction_model.for_user(user_id)
+        scoped_transactions.category_model.set_user_id(user_id)
+
+        # a budget on every expense category, as a heavy budget user would have
+        scoped_budgets = budget_model.for_user(user_id)
+        for category in config.DEFAULT_CATEGORIES_EXPENSE:
+            scoped_budgets.set_budget(category, round(rng.uniform(100, 1000), 2))
+
+        transactions = generate_transactions(rng, transactions_per_user, anchor, days)
+        for start in range(0, len(transactions), chunk_size):
+            scoped_transactions.insert_transactions(transactions[start:start + chunk_size])
+
+        generated.append(GeneratedUser(user_id, email, transactions_per_user))
+    return generated
@@ -0,0 +1,227 @@
+"""
+Benchmark suite: model/analyzer entry points and full page renders at
+several data sizes, results as JSON.
+
+Requires a running mongod, 5.0 or newer ($dateTrunc, $lookup with let
+and pipeline), default mongodb://localhost:27017/finance_tracker_bench.
+Never point it at production data: benchmark users are deleted and
+recreated. In-memory fakes such as mongomock are not supported, they lack
+several of the stages and bulk write options the models use.
+
+usage: python -m benchmarks.run [--uri URI]
+                                [--users 3] [--sizes 1000,10000] [--repeat 5]
+                                [--seed 42] [--output results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_URI = "mongodb://localhost:27017/finance_tracker_bench"
+
+
+def use_database(uri: str):
+    """Point the app's database layer at the benchmark database (before any model import)"""
+    os.environ["MONGO_URI"] = uri
+
+
+def measure(function: Callable, repeat: int) -> dict:
+    """Time `function`: the first (cold) call plus `repeat` warm calls"""
+    started = time.perf_counter()
+    function()
+    first = time.perf_counter() - started
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+
+    return {
+        "first_ms": round(first * 1000, 3),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3),
+        "runs": repeat,
+    }
+
+
+# ======================================
+# pages rendered with streamlit.testing.AppTest
+# (the functions are run as standalone scripts: imports go inside)
+# ======================================
+
+def _dashboard_page():
+    import streamlit as st
+    from database import TransactionModel
+    from analytics.analyzer import FinanceAnalyzer
+    from analytics.visualize import FinanceVisualizer
+    from views import render_dashboard
+
+    transaction_model = TransactionModel().for_user(st.session_state["bench_user_id"])
+    render_dashboard(analyzer_model=FinanceAnalyzer(transaction_model),
+                     transaction_model=transaction_model,
+                     visualizer_model=FinanceVisualizer())
+
+
+def _transactions_page():
+    import streamlit as st
+    from database import CategoryModel, TransactionModel
+    from views import render_transactions
+
+    user_id = st.session_state["bench_user_id"]
+    render_transactions(transaction_model=TransactionModel().for_user(user_id),
+                        category_model=CategoryModel().for_user(user_id, provision=False))
+
+
+def _budget_page():
+    import streamlit as st
+    from database import BudgetModel, CategoryModel
+    from analytics.visualize import FinanceVisualizer
+    from views import render_budgets
+
+    user_id = st.session_state["bench_user_id"]
+    render_budgets(budget_model=BudgetModel().for_user(user_id),
+                   category_model=CategoryModel().for_user(user_id, provision=False),
+                   visualizer_model=FinanceVisualizer())
+
+
+PAGES = {
+    "page.dashboard": _dashboard_page,
+    "page.transactions": _transactions_page,
+    "page.budget": _budget_page,
+}
+
+
+def render_page(page: Callable, user_id: str):
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_function(page, default_timeout=120)
+    app.session_state["bench_user_id"] = user_id
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].message)
+
+
+# ======================================
+# entry points
+# ======================================
+
+def entry_points(user_id: str) -> dict[str, Callable]:
+    from database import BudgetModel, TransactionModel
+    from analytics.analyzer import FinanceAnalyzer
+
+    transactions = TransactionModel().for_user(user_id)
+    budgets = BudgetModel().for_user(user_id)
+    analyzer = FinanceAnalyzer(transactions)
+
+    now = datetime.now()
+    last_30_days = {"start_date": now - timedelta(days=30), "end_date": now}
+
+    points = {
+        "transaction.get_transactions_page": lambda: transactions.get_transactions_page(
+            page_size=20),
+        "transaction.get_transactions_page.filtered": lambda: transactions.get_transactions_page(
+            advanced_filters={**last_30_days, "transaction_type": "Expense"}, page_size=20),
+        "transaction.search_transactions": lambda: transactions.search_transactions("coffee"),
+        "transaction.get_transactions_frame": lambda: transactions.get_transactions_frame(
+            fields=TransactionModel.ANALYSIS_FIELDS),
+        "analyzer.get_dashboard_snapshot.30d": lambda: analyzer.get_dashboard_snapshot(
+            last_30_days["start_date"], last_30_days["end_date"], months=6),
+        "analyzer.get_dashboard_snapshot.all_time": lambda: analyzer.get_dashboard_snapshot(months=6),
+        "analyzer.get_spending_by_category": lambda: analyzer.get_spending_by_category(),
+        "analyzer.get_monthly_trend": lambda: analyzer.get_monthly_trend(months=12),
+        "analyzer.get_statistics_summary": lambda: analyzer.get_statistics_summary(),
+        "analyzer.detect_anomalies": lambda: analyzer.detect_anomalies(),
+        "budget.get_budget_vs_actual": lambda: budgets.get_budget_vs_actual(),
+    }
+    for name, page in PAGES.items():
+        points[name] = lambda page=page: render_page(page, user_id)
+    return points
+
+
+def run_suite(users: int, sizes: list[int], repeat: int, seed: int) -> list[dict]:
+    from benchmarks.data_generator import generate
+
+    results = []
+    for size in sizes:
+        started = time.perf_counter()
+        try:
+            generated = generate(users, size, seed=seed)
+        except Exception as e:
+            # nothing to time at this size, record why and go on
+            results.append({"size": size, "users": users, "name": "generate",
+                            "error": f"{type(e).__name__}: {e}"})
+            print(f"[{size} transactions/user] generation failed: {e}", file=sys.stderr)
+            continue
+        generate_s = time.perf_counter() - started
+        print(f"[{size} transactions/user] generated {users} users in {generate_s:.1f}s", file=sys.stderr)
+
+        results.append({
+            "size": size, "users": users, "name": "generate",
+            "first_ms": round(generate_s * 1000, 3), "runs": 1
+        })
+
+        # time everything for the first user, the others only add volume
+        for name, function in entry_points(generated[0].user_id).items():
+            row = {"size": size, "users": users, "name": name}
+            try:
+                row.update(measure(function, repeat))
+            except Exception as e:
+                # keep timing the other entry points
+                row["error"] = f"{type(e).__name__}: {e}"
+            print(f"  {name}: {row.get('median_ms', row.get('error'))}", file=sys.stderr)
+            results.append(row)
+    return results
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Finance tracker benchmark suite")
+    parser.add_argument("--uri", default=DEFAULT_URI, help="benchmark database (mongod 5.0+)")
+    parser.add_argument("--users", type=int, default=3)
+    parser.add_argument("--sizes", default="1000,10000", help="transactions per user, comma separated")
+    parser.add_argument("--repeat", type=int, default=5, help="warm runs per entry point")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    use_database(args.uri)
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": run_suite(
+            args.users,
+            [int(size) for size in args.sizes.split(",")],
+            args.repeat,
+            args.seed
+        ),
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
@@ -0,0 +1,117 @@
+"""
+Cold-start benchmark: time the imports app.py runs before the first page
+renders.
+
+Every run uses a fresh interpreter (nothing cached in sys.modules) with
+`python -X importtime`, so the slowest modules can be read from the report.
+
+usage: python -m benchmarks.startup [--runs 5] [--top 15] [--output startup.json]
+                                    [--budget SECONDS]
+"""
+import argparse
+import ast
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_FILE = ROOT / "app.py"
+
+# "import time:   self |   cumulative | [indent]module"
+_IMPORTTIME_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def app_imports(app_file: Path = APP_FILE) -> str:
+    """Top-level import statements of app.py, without the page code"""
+    tree = ast.parse(app_file.read_text(encoding="utf-8"))
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports)
+
+
+def run_once(code: str) -> tuple[float, list[dict]]:
+    """
+    Import `code` in a new interpreter.
+
+    Returns:
+        (wall time in seconds, importtime rows of top-level modules)
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True
+    )
+    elapsed = time.perf_counter() - started
+
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing app.py failed:\n{result.stderr[-2000:]}")
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        # one leading space = imported directly, not by another module
+        if match and len(match.group(3)) == 1:
+            modules.append({
+                "module": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+            })
+    return elapsed, modules
+
+
+def benchmark(runs: int = 5, top: int = 15) -> dict:
+    code = app_imports()
+    run_once("pass")  # warm the OS file cache before measuring
+
+    baseline = [run_once("pass")[0] for _ in range(runs)]
+    timings, slowest = [], {}
+    for _ in range(runs):
+        elapsed, modules = run_once(code)
+        timings.append(elapsed)
+        for row in modules:
+            slowest.setdefault(row["module"], []).append(row["cumulative_ms"])
+
+    interpreter = statistics.median(baseline)
+    median = statistics.median(timings)
+    return {
+        "python": sys.version.split()[0],
+        "runs": runs,
+        "interpreter_s": round(interpreter, 4),
+        "app_import_s": {
+            "median": round(median, 4),
+            "min": round(min(timings), 4),
+            "max": round(max(timings), 4),
+        },
+        # time spent in app.py imports alone
+        "app_import_net_s": round(median - interpreter, 4),
+        "slowest_modules_ms": sorted(
+            ({"module": name, "cumulative_ms": round(statistics.median(values), 1)}
+             for name, values in slowest.items()),
+            key=lambda row: row["cumulative_ms"],
+            reverse=True
+        )[:top],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure app.py import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to report")
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--budget", type=float, help="exit 1 if the net import time exceeds SECONDS")
+    args = parser.parse_args()
+
+    report = benchmark(args.runs, args.top)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n", encoding="utf-8")
+    print(text)
+
+    if args.budget is not None and report["app_import_net_s"] > args.budget:
+        print(f"Import time {report['app_import_net_s']}s is over budget ({args.budget}s)", file=sys.stderr)
+        sys.exit(1)
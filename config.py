@@ -9,17 +9,58 @@ APP_NAME = "FINANCE-TRACKER"
 MONGO_URI = os.getenv("MONGO_URI", "localhost:2017")
 DATABASE_NAME = "finance_tracker"
 
+# one MongoClient per process, pool and timeouts tunable per deployment
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "2"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_SOCKET_TIMEOUT_MS = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "30000"))
+# wire compression in order of preference; zstd/snappy need the
+# zstandard/python-snappy packages and are skipped when missing
+MONGO_COMPRESSORS = os.getenv("MONGO_COMPRESSORS", "zstd,snappy,zlib").split(",")
+
+# query instrumentation (opt-in, it adds work to every command): time every
+# command, log the ones slower than SLOW_QUERY_MS and optionally show the
+# per-rerun breakdown in the sidebar (the panel turns the monitor on)
+QUERY_DEBUG_PANEL = os.getenv("QUERY_DEBUG_PANEL", "0") == "1"
+QUERY_MONITOR_ENABLED = os.getenv("QUERY_MONITOR_ENABLED", "0") == "1" or QUERY_DEBUG_PANEL
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# most commands kept per rerun trace (fragment reruns keep appending to it)
+QUERY_TRACE_MAX_RECORDS = int(os.getenv("QUERY_TRACE_MAX_RECORDS", "500"))
+
 # collections
 COLLECTIONS = {
     "user": "users",
     "transaction": "transactions",
     "category": "categories",
-    "budget": "budgets"
+    "budget": "budgets",
+    "rollup": "transaction_rollups"
 }
 
 # transaction types
 TRANSACTION_TYPES = ['Expense', "Income"]
 
+# budget periods (a budget limits expenses of one category per period)
+BUDGET_PERIODS = ["Monthly", "Yearly"]
+
+# number of transactions loaded per "load more" page
+TRANSACTION_PAGE_SIZE = 20
+# rows per page of the transaction table view
+TRANSACTION_TABLE_PAGE_SIZE = 100
+# page sizes offered by the table, large pages let a whole import be edited at once
+TRANSACTION_TABLE_PAGE_SIZES = [100, 500, 1000]
+
+# statement import: rows parsed and inserted per batch
+IMPORT_CHUNK_SIZE = 1000
+# accepted date formats for imported CSV files (ISO 8601 is always accepted)
+IMPORT_DATE_FORMATS = ["%d/%m/%Y", "%Y/%m/%d", "%d-%m-%Y"]
+
+# export: documents per cursor batch
+EXPORT_BATCH_SIZE = 2000
+# largest export served by the app: the file is built in memory (about 80 bytes per row as CSV)
+EXPORT_MAX_ROWS = int(os.getenv("EXPORT_MAX_ROWS", "200000"))
+
 DEFAULT_CATEGORIES_EXPENSE = [
     "Shopping",
     "Transportation",
@@ -32,4 +73,25 @@ DEFAULT_CATEGORIES_INCOME = [
     "Others"
 ]
 
+# dashboard: run independent panel queries concurrently (False = one $facet query)
+DASHBOARD_PARALLEL_QUERIES = True
+# spending heatmap: bin by ISO week/weekday in MongoDB (False = bin a date/amount frame in pandas)
+HEATMAP_SERVER_BINNING = True
+ANALYZER_MAX_WORKERS = int(os.getenv("ANALYZER_MAX_WORKERS", "8"))
+
+# per-user category cache (categories rarely change, writes invalidate it)
+CATEGORY_CACHE_TTL_SECONDS = 300
+CATEGORY_CACHE_MAX_USERS = 1000
+# per-user set of budgeted categories, lets writes skip the overspend check
+# (a budget set in another process is picked up after at most this long)
+BUDGET_CACHE_TTL_SECONDS = 60
+
+# per-process LRU of plotly figures, keyed on a hash of the chart's input data
+FIGURE_CACHE_MAX_ENTRIES = int(os.getenv("FIGURE_CACHE_MAX_ENTRIES", "256"))
+# inputs longer than this are not hashed (a hit would cost a full pass anyway)
+FIGURE_CACHE_MAX_ROWS = int(os.getenv("FIGURE_CACHE_MAX_ROWS", "5000"))
+
+# most points drawn by the transaction timeline, longer histories are downsampled
+TIMELINE_MAX_POINTS = int(os.getenv("TIMELINE_MAX_POINTS", "2000"))
+
 
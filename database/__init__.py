@@ -2,9 +2,11 @@
 from .category_model import CategoryModel
 from .transaction_model import TransactionModel
 from .user_model import UserModel
+from .budget_model import BudgetModel
 
 __all__ = [
     "CategoryModel",
     "TransactionModel",
-    "UserModel"
+    "UserModel",
+    "BudgetModel"
 ]
\ No newline at end of file
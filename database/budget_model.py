@@ -0,0 +1,287 @@
+from database.database_manager import DatabaseManager
+from database.category_model import CategoryModel, CategoryCache
+from database.rollup_model import RollupModel, _next_month
+import config
+import copy
+from datetime import datetime
+from typing import Iterable, Optional
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+import pandas as pd
+
+collection_name = config.COLLECTIONS['budget']
+
+
+def period_range(period: str, reference_date: datetime) -> tuple[datetime, datetime]:
+    """[start, end) of the budget period containing `reference_date`"""
+    if period == "Yearly":
+        return datetime(reference_date.year, 1, 1), datetime(reference_date.year + 1, 1, 1)
+    start = datetime(reference_date.year, reference_date.month, 1)
+    return start, _next_month(start)
+
+
+def period_key(period: str, reference_date: datetime) -> str:
+    """Key of one budget period, e.g. "2025-03" (Monthly) or "2025" (Yearly)"""
+    if period == "Yearly":
+        return f"{reference_date.year}"
+    return f"{reference_date.year}-{reference_date.month:02d}"
+
+
+class BudgetModel:
+    """
+    Expense budgets per (category, period) of the current user.
+
+    Budget-vs-actual comes from one aggregation over the budgets ($lookup
+    into the monthly rollups, or the raw transactions until the user's
+    rollups are ready). Overspend alerts are stored on the budget when a
+    transaction is written, so reading them is a plain find.
+
+    Budget document:
+        {user_id, category, period, amount, overspent: {period key: {...}}}
+    """
+
+    # shared by every BudgetModel in the process: user_id -> budgeted category names
+    _budgeted = CategoryCache(
+        ttl_seconds=config.BUDGET_CACHE_TTL_SECONDS,
+        max_users=config.CATEGORY_CACHE_MAX_USERS
+    )
+
+    def __init__(self, user_id: Optional[str] = None):
+        self.db_manager = DatabaseManager()
+        self.collection = self.db_manager.get_collection(collection_name=collection_name)
+        self.user_id = user_id
+
+        # budgets are only allowed on existing expense categories
+        self.category_model = CategoryModel(user_id)
+        self.rollup_model = RollupModel()
+
+    def for_user(self, user_id: str) -> "BudgetModel":
+        """Handle scoped to one user, sharing this model's collections"""
+        scoped = copy.copy(self)
+        scoped.category_model = self.category_model.for_user(user_id, provision=False)
+        scoped.user_id = ObjectId(user_id) if user_id is not None else None
+        return scoped
+
+    def set_user_id(self, user_id: Optional[str]):
+        self.user_id = ObjectId(user_id) if user_id is not None else None
+        self.category_model.set_user_id(user_id, provision=False)
+
+    # ======================================
+    # CRUD
+    # ======================================
+
+    def set_budget(self, category: str, amount: float, period: str = "Monthly"):
+        """
+        Create or update the budget of an expense category.
+
+        Args:
+            category: Expense category name
+            amount: Budget limit for one period, must be > 0
+            period: one of config.BUDGET_PERIODS
+        """
+        if period not in config.BUDGET_PERIODS:
+            raise ValueError(f"Invalid period. Choose one of {config.BUDGET_PERIODS}")
+        if amount <= 0:
+            raise ValueError("Budget amount must be greater than zero")
+        if not self.category_model.category_exists(category_name=category, category_type="Expense"):
+            raise ValueError("Invalid category. Category does not exist.")
+
+        result = self.collection.update_one(
+            {"user_id": self.user_id, "category": category, "period": period},
+            {
+                "$set": {"amount": amount, "last_modified": datetime.now()},
+                "$setOnInsert": {"created_at": datetime.now()}
+            },
+            upsert=True
+        )
+        self._budgeted.invalidate(self.user_id)
+
+        # the limit changed, re-check the current period
+        self.refresh_alerts(self.user_id, [category], [datetime.now()])
+        return result.upserted_id
+
+    def delete_budget(self, category: str, period: str = "Monthly") -> int:
+        result = self.collection.delete_one(
+            {"user_id": self.user_id, "category": category, "period": period}
+        )
+        self._budgeted.invalidate(self.user_id)
+        return result.deleted_count
+
+    def get_budgets(self) -> list[dict]:
+        return list(self.collection.find({"user_id": self.user_id}).sort("category", 1))
+
+    # ======================================
+    # budget vs actual
+    # ======================================
+
+    def get_budget_vs_actual(self, reference_date: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Every budget with the expenses of its period, in one aggregation.
+
+        Args:
+            reference_date: Any date inside the periods to compare, default now
+
+        Returns:
+            DataFrame with Category, period, amount (budget), Total (actual),
+            Remaining and Used (%)
+        """
+        rows = list(self.collection.aggregate(
+            self._budget_vs_actual_pipeline(self.user_id, reference_date or datetime.now())
+        ))
+
+        df = pd.DataFrame(rows, columns=["category", "period", "amount", "total"])
+        df = df.rename(columns={"category": "Category", "total": "Total"})
+        df["Remaining"] = df["amount"] - df["Total"]
+        df["Used (%)"] = (df["Total"] / df["amount"] * 100).round(1)
+        return df
+
+    def _budget_vs_actual_pipeline(
+        self,
+        user_id: ObjectId,
+        reference_date: datetime,
+        categories: Optional[Iterable[str]] = None
+    ) -> list[dict]:
+        """Budgets of `user_id` joined with the expenses of their period"""
+        match = {"user_id": user_id}
+        if categories is not None:
+            match["category"] = {"$in": list(categories)}
+
+        # each budget picks the month or the year around reference_date
+        month_start, month_end = period_range("Monthly", reference_date)
+        year_start, year_end = period_range("Yearly", reference_date)
+        is_yearly = {"$eq": ["$period", "Yearly"]}
+
+        if self.rollup_model.is_ready(user_id):
+            # sum whole-month cells, the current month cell is kept up to date on write
+            lookup = {
+                "from": config.COLLECTIONS['rollup'],
+                "let": {"category": "$category", "start": "$start", "end": "$end"},
+                "pipeline": [
+                    {"$match": {
+                        "user_id": user_id,
+                        "granularity": "month",
+                        "type": "Expense",
+                        "$expr": {"$and": [
+                            {"$eq": ["$category", "$$category"]},
+                            {"$gte": ["$bucket", "$$start"]},
+                            {"$lt": ["$bucket", "$$end"]}
+                        ]}
+                    }},
+                    {"$group": {"_id": None, "total": {"$sum": "$sum"}}}
+                ],
+                "as": "actual"
+            }
+        else:
+            lookup = {
+                "from": config.COLLECTIONS['transaction'],
+                "let": {"category": "$category", "start": "$start", "end": "$end"},
+                "pipeline": [
+                    {"$match": {
+                        "user_id": user_id,
+                        "type": "Expense",
+                        "$expr": {"$and": [
+                            {"$eq": ["$category", "$$category"]},
+                            {"$gte": ["$date", "$$start"]},
+                            {"$lt": ["$date", "$$end"]}
+                        ]}
+                    }},
+                    {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+                ],
+                "as": "actual"
+            }
+
+        return [
+            {"$match": match},
+            {"$addFields": {
+                "start": {"$cond": [is_yearly, year_start, month_start]},
+                "end": {"$cond": [is_yearly, year_end, month_end]}
+            }},
+            {"$lookup": lookup},
+            {"$project": {
+                "category": 1,
+                "period": 1,
+                "amount": 1,
+                "start": 1,
+                "total": {"$ifNull": [{"$first": "$actual.total"}, 0]}
+            }},
+            {"$sort": {"category": 1, "period": 1}}
+        ]
+
+    # ======================================
+    # overspend alerts (write path)
+    # ======================================
+
+    def _budgeted_categories(self, user_id: ObjectId) -> set[str]:
+        """Categories with at least one budget (cached, most users have none)"""
+        categories = self._budgeted.get(user_id)
+        if categories is None:
+            categories = set(self.collection.distinct("category", {"user_id": user_id}))
+            self._budgeted.put(user_id, categories)
+        return categories
+
+    def refresh_alerts(
+        self,
+        user_id: ObjectId,
+        categories: Iterable[str],
+        dates: Iterable[datetime]
+    ):
+        """
+        Re-check the budgets of `categories` for the periods around `dates`
+        and flag or clear their overspend alert.
+
+        Called after every transaction write, one aggregation per distinct
+        month touched (usually one), none when no touched category has a
+        budget.
+        """
+        if not user_id:
+            return
+        categories = set(categories) & self._budgeted_categories(user_id)
+        if not categories:
+            return
+
+        months = {datetime(value.year, value.month, 1) for value in dates}
+        requests = []
+        for month in months:
+            for row in self.collection.aggregate(
+                self._budget_vs_actual_pipeline(user_id, month, categories)
+            ):
+                field = f"overspent.{period_key(row['period'], row['start'])}"
+                if row['total'] > row['amount']:
+                    update = {"$set": {field: {
+                        "spent": row['total'],
+                        "amount": row['amount'],
+                        "at": datetime.now()
+                    }}}
+                else:
+                    update = {"$unset": {field: ""}}
+                requests.append(UpdateOne({"_id": row['_id']}, update))
+
+        if requests:
+            self.collection.bulk_write(requests, ordered=False)
+
+    def get_alerts(self, reference_date: Optional[datetime] = None) -> list[dict]:
+        """
+        Budgets overspent in the periods around `reference_date` (default now).
+
+        Returns:
+            list of {category, period, amount, spent}
+        """
+        reference_date = reference_date or datetime.now()
+        keys = {period: period_key(period, reference_date) for period in config.BUDGET_PERIODS}
+
+        cursor = self.collection.find({
+            "user_id": self.user_id,
+            "$or": [
+                {"period": period, f"overspent.{key}": {"$exists": True}}
+                for period, key in keys.items()
+            ]
+        })
+        return [
+            {
+                "category": budget['category'],
+                "period": budget['period'],
+                "amount": budget['amount'],
+                "spent": budget['overspent'][keys[budget['period']]]['spent'],
+            }
+            for budget in cursor
+        ]
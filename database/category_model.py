@@ -1,13 +1,69 @@
 
 from database.database_manager import DatabaseManager
+from database.rollup_model import RollupModel
 import config
 from datetime import datetime
 from typing import Optional
+from collections import OrderedDict
+import copy
+import threading
+import time
 from bson.objectid import ObjectId
+from pymongo import UpdateOne
 
 collection_name = config.COLLECTIONS['category']
 
+
+class CategoryCache:
+    """
+    Per-user cache of category documents.
+
+    Entries expire after `ttl_seconds`; when more than `max_users` users are
+    cached the least recently used one is evicted.
+    """
+
+    def __init__(self, ttl_seconds: float, max_users: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_users = max_users
+        self._entries: OrderedDict = OrderedDict() # user_id -> (expires_at, categories)
+        self._lock = threading.Lock()
+
+    def get(self, user_id) -> Optional[list[dict]]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            expires_at, categories = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+
+            self._entries.move_to_end(user_id) # mark as recently used
+            return categories
+
+    def put(self, user_id, categories: list[dict]):
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl_seconds, categories)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_users:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+
 class CategoryModel:
+    # user ids whose default categories are known to exist (in-process memo)
+    _provisioned_users: set = set()
+
+    # shared by every CategoryModel in the process, keyed by user_id
+    _cache = CategoryCache(
+        ttl_seconds=config.CATEGORY_CACHE_TTL_SECONDS,
+        max_users=config.CATEGORY_CACHE_MAX_USERS
+    )
+
     def __init__(self, user_id: Optional[str] = None):
         self.db_manager = DatabaseManager()
         self.collection = self.db_manager.get_collection(collection_name=collection_name)
@@ -15,32 +71,64 @@ class CategoryModel:
         # init:
         self.user_id = user_id
 
-    def set_user_id(self, user_id: str):
+    def for_user(self, user_id: str, provision: bool = True) -> "CategoryModel":
+        """
+        Handle scoped to one user.
+
+        Shares this model's collection (and the process-wide cache), so it
+        is cheap to create per session while the shared model stays untouched.
+        """
+        scoped = copy.copy(self)
+        scoped.set_user_id(user_id, provision=provision)
+        return scoped
+
+    def set_user_id(self, user_id: str, provision: bool = True):
         self.user_id = ObjectId(user_id) if user_id is not None else None
 
         # after we have user_id, initialize their default categories
-        self._initialize_user_default_categories()
+        # (callers that only validate against categories can skip this)
+        if provision:
+            self._initialize_user_default_categories()
 
     def _initialize_user_default_categories(self):
-        """Initialize user categories if they dont exist"""
+        """Initialize user categories if they dont exist (once per user)"""
 
         # Check if there is user_id, exist earlier
         if not self.user_id:
             return
         
-        # EXPENSE
-        for cate in config.DEFAULT_CATEGORIES_EXPENSE:
-            # # calling by params order
-            # self.upsert_category("Expense", cate)
+        # already provisioned by this process -> no round trip at all
+        if self.user_id in CategoryModel._provisioned_users:
+            return
 
-            # calling by params keywords
-            self.upsert_category(category_type = "Expense", category_name= cate)
+        users_col = self.db_manager.get_collection(config.COLLECTIONS['user'])
+        provisioned = users_col.find_one(
+            {"_id": self.user_id, "categories_provisioned": True},
+            {"_id": 1}
+        )
 
-        # INCOME
-        for cate in config.DEFAULT_CATEGORIES_INCOME:
-            self.upsert_category(category_type = "Income", category_name = cate)
+        if not provisioned:
+            # EXPENSE + INCOME defaults in a single bulk write
+            requests = [
+                UpdateOne(*self._upsert_spec("Expense", cate), upsert=True)
+                for cate in config.DEFAULT_CATEGORIES_EXPENSE
+            ] + [
+                UpdateOne(*self._upsert_spec("Income", cate), upsert=True)
+                for cate in config.DEFAULT_CATEGORIES_INCOME
+            ]
+            self.collection.bulk_write(requests, ordered=False)
 
-    def upsert_category(self, category_type: str, category_name: str):
+            # persist the marker so other processes skip this too
+            users_col.update_one(
+                {"_id": self.user_id},
+                {"$set": {"categories_provisioned": True}}
+            )
+            self._cache.invalidate(self.user_id)
+
+        CategoryModel._provisioned_users.add(self.user_id)
+
+    def _upsert_spec(self, category_type: str, category_name: str) -> tuple[dict, dict]:
+        """Build (filter, update) for upserting one category of current user"""
 
         # define filter
         filter_ = {
@@ -58,41 +146,47 @@ class CategoryModel:
                 "created_at": datetime.now()
             } 
         }
+        return filter_, update_doc
+
+    def upsert_category(self, category_type: str, category_name: str):
+        filter_, update_doc = self._upsert_spec(category_type, category_name)
 
         result = self.collection.update_one(
             filter_,
             update_doc,
             upsert=True
         )
+        self._cache.invalidate(self.user_id)
         return result.upserted_id
 
     def delete_category(self, category_type: str, category_name: str):
         result = self.collection.delete_one({"type": category_type, "name": category_name, "user_id": self.user_id}) # add user_id condition
+        self._cache.invalidate(self.user_id)
         return result.deleted_count
 
+    def _get_user_categories(self) -> list[dict]:
+        """All categories of current user, newest first, served from cache"""
+        categories = self._cache.get(self.user_id)
+        if categories is None:
+            categories = list(self.collection.find({"user_id": self.user_id}).sort("created_at", -1))
+            self._cache.put(self.user_id, categories)
+        return categories
+
     def get_categories_by_type(self, category_type: str):
-        return list(self.collection.find({"type": category_type, "user_id": self.user_id}).sort("created_at", -1))  # add user_id condition
+        return [cate for cate in self._get_user_categories() if cate.get("type") == category_type]
     
     def get_total(self):
-        result = self.collection.find({"user_id": self.user_id})
-        result = list(result)
-        return result
+        return list(self._get_user_categories())
+
     def category_exists(self, category_name: str, category_type: Optional[str] = None) -> bool:
         """
         Check if a category exists for current user
         """
-        query = {
-            "name": category_name,
-            "user_id": self.user_id
-        }
-
-        if category_type:
-            query["type"] = category_type
-
-        return self.collection.count_documents(query) > 0
-    
-    def delete_category(self, category_type: str, category_name: str):
-        result = self.collection.delete_one(...)
+        return any(
+            cate.get("name") == category_name
+            and (not category_type or cate.get("type") == category_type)
+            for cate in self._get_user_categories()
+        )
     
     def delete_category_safe(self, category_type: str, category_name: str, strategy: str):
         """
@@ -115,16 +209,35 @@ class CategoryModel:
         if strategy == "block" and affected_count > 0:
             raise ValueError(f"{affected_count} transactions will be affected")
 
+        # rollup cells of the affected transactions, moved or removed below
+        rollup_model = RollupModel()
+        affected_cells = []
+        if affected_count > 0 and strategy in ("reassign", "cascade"):
+            affected_cells = rollup_model.cells_for(self.user_id, {"category": category_name})
+
         if strategy == "reassign":
             transactions_col.update_many(
                 {"user_id": self.user_id, "category": category_name},
                 {"$set": {"category": "Others"}}
             )
+            rollup_model.apply(
+                self.user_id,
+                added=[{**cell, "category": "Others"} for cell in affected_cells],
+                removed=affected_cells
+            )
 
         if strategy == "cascade":
             transactions_col.delete_many(
                 {"user_id": self.user_id, "category": category_name}
             )
+            rollup_model.apply(self.user_id, removed=affected_cells)
+
+        # spending left this category (and moved to Others): re-check their budgets
+        expense_days = [cell['bucket'] for cell in affected_cells if cell['type'] == "Expense"]
+        if expense_days:
+            # imported here, budget_model imports this module
+            from database.budget_model import BudgetModel
+            BudgetModel().refresh_alerts(self.user_id, {category_name, "Others"}, expense_days)
 
         # finally delete category
         self.collection.delete_one({
@@ -132,6 +245,7 @@ class CategoryModel:
             "name": category_name,
             "user_id": self.user_id
         })
+        self._cache.invalidate(self.user_id)
 
         return affected_count
 
@@ -1,24 +1,148 @@
-from pymongo import MongoClient, DESCENDING
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING
+from pymongo.errors import OperationFailure
+from pymongo.monitoring import ConnectionPoolListener
+from database.query_monitor import query_monitor
+import importlib.util
+import threading
 import config
 import os
+
+# Index definitions, one entry per query shape used by the models.
+# Equality fields first, then sort fields, then range fields (ESR rule).
+INDEXES = {
+    config.COLLECTIONS["transaction"]: [
+        # TransactionModel.get_transactions / get_transactions_frame:
+        # {user_id, ...} sorted by created_at
+        ([("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+        # TransactionModel.get_transactions_page:
+        # {user_id, date range} sorted by (date, _id)
+        ([("user_id", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], {}),
+        # FinanceAnalyzer panels: {user_id, type, date range} grouped on
+        # category/amount -> covering index, no document fetch needed
+        ([("user_id", ASCENDING), ("type", ASCENDING), ("date", DESCENDING),
+          ("category", ASCENDING), ("amount", ASCENDING)], {}),
+        # CategoryModel.delete_category_safe: {user_id, category}
+        ([("user_id", ASCENDING), ("category", ASCENDING)], {}),
+        # description search: {user_id, keywords: /^prefix/} (multikey)
+        ([("user_id", ASCENDING), ("keywords", ASCENDING)], {}),
+    ],
+    config.COLLECTIONS["category"]: [
+        ([("user_id", DESCENDING), ("type", DESCENDING), ("name", DESCENDING)], {"unique": True}),
+        # CategoryModel._get_user_categories: {user_id} sorted by created_at
+        ([("user_id", ASCENDING), ("created_at", DESCENDING)], {}),
+    ],
+    config.COLLECTIONS["budget"]: [
+        # BudgetModel: one budget per (user, category, period)
+        ([("user_id", ASCENDING), ("category", ASCENDING), ("period", ASCENDING)], {"unique": True}),
+    ],
+    config.COLLECTIONS["rollup"]: [
+        # RollupModel: one cell per (user, granularity, bucket, type, category),
+        # also the $merge key of RollupModel.rebuild
+        ([("user_id", ASCENDING), ("granularity", ASCENDING), ("bucket", ASCENDING),
+          ("type", ASCENDING), ("category", ASCENDING)], {"unique": True}),
+    ],
+    config.COLLECTIONS["user"]: [
+        # UserModel.login: {email} on every rerun
+        ([("email", ASCENDING)], {"unique": True}),
+    ],
+}
+
+# Indexes created by earlier versions and superseded by INDEXES, dropped
+# at startup so writes stop maintaining them.
+LEGACY_INDEXES = {
+    # first transaction index, (user_id, date, _id) covers its queries
+    config.COLLECTIONS["transaction"]: ["user_id_-1_date_-1"],
+}
+
+
+class PoolStatsListener(ConnectionPoolListener):
+    """Count connection pool events so pool usage can be inspected at runtime"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = {
+            "created": 0,
+            "closed": 0,
+            "checked_out": 0,
+            "checked_in": 0,
+            "checkout_failed": 0,
+            "pools_cleared": 0,
+        }
+
+    def _count(self, name: str):
+        with self._lock:
+            self.counters[name] += 1
+
+    def pool_created(self, event): pass
+    def pool_ready(self, event): pass
+    def pool_closed(self, event): pass
+    def pool_cleared(self, event): self._count("pools_cleared")
+    def connection_created(self, event): self._count("created")
+    def connection_ready(self, event): pass
+    def connection_closed(self, event): self._count("closed")
+    def connection_check_out_started(self, event): pass
+    def connection_check_out_failed(self, event): self._count("checkout_failed")
+    def connection_checked_out(self, event): self._count("checked_out")
+    def connection_checked_in(self, event): self._count("checked_in")
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        counters["open"] = counters["created"] - counters["closed"]
+        counters["in_use"] = counters["checked_out"] - counters["checked_in"]
+        return counters
+
+
+def _available_compressors() -> list[str]:
+    """Configured wire compressors whose python package is installed"""
+    required_module = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+    return [
+        name for name in config.MONGO_COMPRESSORS
+        if name in required_module and importlib.util.find_spec(required_module[name])
+    ]
+
+
 class DatabaseManager:
+    """
+    Process-wide MongoDB access.
+
+    Every DatabaseManager() returns the same instance, so all models share
+    one MongoClient and its connection pool.
+    """
     _instance = None
-    def __init__(self):
-        uri = os.getenv("MONGO_URI")
-        if not uri:
-            raise ValueError("❌ MONGO_URI is not set")
+    _lock = threading.Lock()
 
-        self.client = MongoClient(uri)
-        self.db = self.client.get_default_database()
     def __new__(cls):
         if cls._instance is None:
-            cls._instance = super(DatabaseManager, cls).__new__(cls)
-            cls._instance._initialize()
+            with cls._lock:
+                # another thread may have won the race while we waited
+                if cls._instance is None:
+                    instance = super(DatabaseManager, cls).__new__(cls)
+                    instance._initialize()
+                    cls._instance = instance
         return cls._instance
         
     def _initialize(self):
-        self.client = MongoClient(config.MONGO_URI)
-        self.db = self.client[config.DATABASE_NAME]
+        if not os.getenv("MONGO_URI"):
+            raise ValueError("❌ MONGO_URI is not set")
+
+        self.pool_stats = PoolStatsListener()
+        listeners = [self.pool_stats]
+        if config.QUERY_MONITOR_ENABLED:
+            listeners.append(query_monitor)
+        self.client = MongoClient(
+            config.MONGO_URI,
+            maxPoolSize=config.MONGO_MAX_POOL_SIZE,
+            minPoolSize=config.MONGO_MIN_POOL_SIZE,
+            maxIdleTimeMS=config.MONGO_MAX_IDLE_TIME_MS,
+            connectTimeoutMS=config.MONGO_CONNECT_TIMEOUT_MS,
+            serverSelectionTimeoutMS=config.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+            socketTimeoutMS=config.MONGO_SOCKET_TIMEOUT_MS,
+            compressors=_available_compressors() or None,
+            event_listeners=listeners
+        )
+        # database from the URI path, config.DATABASE_NAME otherwise
+        self.db = self.client.get_default_database(default=config.DATABASE_NAME)
         try:
             # test connection
             self.db.command("ping")
@@ -29,13 +153,41 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error in connect: {e}")
             raise e
+
+    def get_pool_stats(self) -> dict:
+        """Connection pool counters plus the configured limits"""
+        return {
+            **self.pool_stats.snapshot(),
+            "max_pool_size": config.MONGO_MAX_POOL_SIZE,
+            "min_pool_size": config.MONGO_MIN_POOL_SIZE,
+            "compressors": _available_compressors(),
+        }
         
     def _create_index(self):
-        "Create indexes for better performance"
-        self.db.transactions.create_index([("user_id", DESCENDING), ("date", DESCENDING)])
-        self.db.categories.create_index([("user_id", DESCENDING),
-                                           ("type", DESCENDING),
-                                           ("name", DESCENDING)], unique = True)
+        "Create indexes for better performance (one createIndexes per collection)"
+        for collection_name, indexes in INDEXES.items():
+            collection = self.db[collection_name]
+            try:
+                collection.create_indexes([IndexModel(keys, **options) for keys, options in indexes])
+            except OperationFailure:
+                # e.g. duplicated emails block the unique index: retry one by
+                # one so the other indexes still get built, keep the app running
+                for keys, options in indexes:
+                    try:
+                        collection.create_index(keys, **options)
+                    except OperationFailure as e:
+                        print(f"Error in create index {keys} on {collection_name}: {e}")
+
+        for collection_name, names in LEGACY_INDEXES.items():
+            existing = self.db[collection_name].index_information()
+            for name in names:
+                if name not in existing:
+                    continue
+                try:
+                    self.db[collection_name].drop_index(name)
+                except OperationFailure as e:
+                    # another process may have dropped it first
+                    print(f"Error in drop index {name} on {collection_name}: {e}")
         
     def get_collection(self, collection_name: str):
         """Get a collection from db"""
@@ -0,0 +1,69 @@
+"""
+Maintenance commands for derived data stored next to the transactions.
+
+usage: python -m database.maintenance backfill-keywords
+       python -m database.maintenance rebuild-rollups [--user-id ID]
+
+rebuild-rollups must run with the app stopped (see RollupModel.rebuild).
+"""
+import argparse
+from typing import Optional
+from bson.objectid import ObjectId
+from pymongo import UpdateOne
+
+import config
+from database.database_manager import DatabaseManager
+from database.transaction_model import tokenize_text
+from database.rollup_model import RollupModel
+
+
+def backfill_keywords(batch_size: int = 1000) -> int:
+    """
+    Compute `keywords` for transactions written before description search
+    used the keywords index.
+
+    Returns:
+        number of updated transactions
+    """
+    collection = DatabaseManager().get_collection(config.COLLECTIONS["transaction"])
+    cursor = collection.find(
+        {"keywords": {"$exists": False}},
+        {"description": 1}
+    ).batch_size(batch_size)
+
+    updated = 0
+    requests = []
+    for doc in cursor:
+        requests.append(UpdateOne(
+            {"_id": doc["_id"]},
+            {"$set": {"keywords": tokenize_text(doc.get("description"))}}
+        ))
+        if len(requests) >= batch_size:
+            updated += collection.bulk_write(requests, ordered=False).modified_count
+            requests = []
+
+    if requests:
+        updated += collection.bulk_write(requests, ordered=False).modified_count
+    return updated
+
+
+def rebuild_rollups(user_id: Optional[str] = None):
+    """
+    Recompute the daily/monthly rollups from raw transactions.
+    Stop the app first, writes made during the rebuild can be lost.
+    """
+    RollupModel().rebuild(ObjectId(user_id) if user_id else None)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Finance tracker maintenance")
+    parser.add_argument("command", choices=["backfill-keywords", "rebuild-rollups"])
+    parser.add_argument("--user-id", help="only rebuild this user (rebuild-rollups)")
+    args = parser.parse_args()
+
+    if args.command == "backfill-keywords":
+        print(f"Backfilled keywords on {backfill_keywords()} transactions")
+
+    elif args.command == "rebuild-rollups":
+        rebuild_rollups(args.user_id)
+        print("Rebuilt rollups for", args.user_id or "all users")
@@ -0,0 +1,207 @@
+import contextvars
+import logging
+import os
+import sys
+import threading
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Optional
+
+import bson
+from pymongo.monitoring import CommandListener
+
+import config
+
+logger = logging.getLogger("finance_tracker.slow_query")
+
+# latency histogram bucket upper bounds, in ms (last bucket is open ended)
+HISTOGRAM_BOUNDS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000]
+
+# commands that are not application queries
+_IGNORED_COMMANDS = {"ping", "hello", "ismaster", "isMaster", "endSessions", "buildInfo", "killCursors"}
+
+# command fields worth logging for a slow query
+_QUERY_KEYS = ("filter", "pipeline", "updates", "deletes", "query")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_SKIPPED_FILES = {os.path.abspath(__file__), os.path.join(_ROOT, "database", "database_manager.py")}
+
+# queries of the current rerun, see QueryMonitor.trace
+_current_trace: contextvars.ContextVar[Optional[deque]] = contextvars.ContextVar("query_trace", default=None)
+
+
+@lru_cache(maxsize=None)
+def _is_app_file(filename: str) -> bool:
+    return (filename.startswith(_ROOT) and filename not in _SKIPPED_FILES
+            and "site-packages" not in filename)
+
+
+def _caller(depth: int = 2) -> str:
+    """
+    The `depth` innermost app frames issuing the command,
+    e.g. "FinanceAnalyzer._run > TransactionModel.aggregate".
+
+    Only code objects are looked at (file test cached, qualified name
+    from co_qualname), so the walk stays cheap on every command.
+    """
+    names = []
+    frame = sys._getframe(2)
+    while frame is not None and len(names) < depth:
+        code = frame.f_code
+        if _is_app_file(code.co_filename):
+            name = code.co_qualname
+            if not names or names[-1] != name:
+                names.append(name)
+        frame = frame.f_back
+    return " > ".join(reversed(names)) or "unknown"
+
+
+def _returned_documents(reply: dict) -> int:
+    cursor = reply.get("cursor")
+    if cursor is not None:
+        return len(cursor.get("firstBatch", cursor.get("nextBatch", [])))
+    return int(reply.get("n", 0))
+
+
+class QueryMonitor(CommandListener):
+    """
+    Time every MongoDB command and tag it with the model method behind it.
+
+    Keeps per (caller, command) latency histograms for the process, logs
+    commands slower than config.SLOW_QUERY_MS, and collects the commands
+    of the current rerun inside `trace()`. Reply sizes are only measured
+    for slow commands (re-encoding every reply would cost more than the
+    monitor is meant to find), so `bytes` is 0 for the others.
+    """
+
+    def __init__(self, slow_query_ms: float = config.SLOW_QUERY_MS):
+        self.slow_query_ms = slow_query_ms
+        self._lock = threading.Lock()
+        self._pending = {} # request_id -> (started record, trace list)
+        self._stats = {} # (caller, command) -> aggregates
+
+    # ======================================
+    # listener callbacks (run on the thread issuing the command)
+    # ======================================
+
+    def started(self, event):
+        if event.command_name in _IGNORED_COMMANDS:
+            return
+        command = event.command
+        target = command.get(event.command_name) # collection name, except for getMore
+        record = {
+            "caller": _caller(),
+            "command": event.command_name,
+            "collection": target if isinstance(target, str) else command.get("collection", ""),
+            # only kept for the slow query log
+            "query": next((command[key] for key in _QUERY_KEYS if key in command), None),
+        }
+        with self._lock:
+            self._pending[event.request_id] = (record, _current_trace.get())
+
+    def succeeded(self, event):
+        size = 0
+        if event.duration_micros >= self.slow_query_ms * 1000:
+            size = len(bson.encode(event.reply))
+        self._finish(event, documents=_returned_documents(event.reply), size=size)
+
+    def failed(self, event):
+        self._finish(event, documents=0, size=0, error=str(event.failure.get("errmsg", event.failure)))
+
+    def _finish(self, event, documents: int, size: int, error: Optional[str] = None):
+        with self._lock:
+            pending = self._pending.pop(event.request_id, None)
+        if pending is None:
+            return
+
+        record, trace = pending
+        query = record.pop("query")
+        record.update({
+            "duration_ms": event.duration_micros / 1000,
+            "documents": documents,
+            "bytes": size,
+            "error": error,
+        })
+
+        self._add_to_stats(record)
+        if trace is not None:
+            trace.append(record)
+
+        if record["duration_ms"] >= self.slow_query_ms:
+            logger.warning(
+                "slow query %.1fms %s %s.%s docs=%d bytes=%d query=%.500r",
+                record["duration_ms"], record["caller"], record["collection"],
+                record["command"], documents, size, query
+            )
+
+    # ======================================
+    # aggregates
+    # ======================================
+
+    def _add_to_stats(self, record: dict):
+        bucket = next(
+            (index for index, bound in enumerate(HISTOGRAM_BOUNDS_MS) if record["duration_ms"] <= bound),
+            len(HISTOGRAM_BOUNDS_MS)
+        )
+        with self._lock:
+            stats = self._stats.setdefault((record["caller"], record["command"]), {
+                "count": 0, "errors": 0, "total_ms": 0.0, "max_ms": 0.0,
+                "documents": 0, "bytes": 0,
+                "histogram": [0] * (len(HISTOGRAM_BOUNDS_MS) + 1),
+            })
+            stats["count"] += 1
+            stats["errors"] += record["error"] is not None
+            stats["total_ms"] += record["duration_ms"]
+            stats["max_ms"] = max(stats["max_ms"], record["duration_ms"])
+            stats["documents"] += record["documents"]
+            stats["bytes"] += record["bytes"]
+            stats["histogram"][bucket] += 1
+
+    def snapshot(self) -> list[dict]:
+        """Aggregates per (caller, command), slowest total first"""
+        with self._lock:
+            rows = [
+                {"caller": caller, "command": command, **stats, "histogram": list(stats["histogram"])}
+                for (caller, command), stats in self._stats.items()
+            ]
+        for row in rows:
+            row["mean_ms"] = row["total_ms"] / row["count"]
+        return sorted(rows, key=lambda row: row["total_ms"], reverse=True)
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    # ======================================
+    # per-rerun breakdown
+    # ======================================
+
+    @contextmanager
+    def trace(self):
+        """
+        Collect the commands issued in this context (e.g. one Streamlit rerun).
+
+        Threads started with contextvars.copy_context() (see
+        analytics.analyzer.run_concurrently) report into the same list,
+        which keeps the last config.QUERY_TRACE_MAX_RECORDS commands.
+        """
+        records = deque(maxlen=config.QUERY_TRACE_MAX_RECORDS)
+        token = _current_trace.set(records)
+        try:
+            yield records
+        finally:
+            _current_trace.reset(token)
+
+    def start_trace(self) -> deque:
+        """
+        Like trace(), for a whole script run: replaced by the next call.
+        Fragment reruns skip app.py and keep appending, hence the bound.
+        """
+        records = deque(maxlen=config.QUERY_TRACE_MAX_RECORDS)
+        _current_trace.set(records)
+        return records
+
+
+# one monitor per process, registered on the shared MongoClient
+query_monitor = QueryMonitor()
@@ -0,0 +1,127 @@
+"""
+Report model queries that are not served by an index.
+
+Runs explain() on the query shapes the models actually send and flags
+plans that contain a COLLSCAN (full collection scan) or a blocking SORT
+stage (in-memory sort).
+
+usage: python -m database.query_plan_check
+"""
+import sys
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+
+from database.transaction_model import TransactionModel
+from database.category_model import CategoryModel
+from database.user_model import UserModel
+
+# plan stages that mean "no index used" / "sorted in memory"
+BAD_STAGES = {"COLLSCAN", "SORT"}
+
+
+def _find_winning_plans(explain: dict) -> list[dict]:
+    """Collect every winningPlan in an explain output (find or aggregate)"""
+    plans = []
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                # slot based engine nests the classic plan under queryPlan
+                plans.append(value.get("queryPlan", value))
+            else:
+                plans.extend(_find_winning_plans(value))
+    elif isinstance(explain, list):
+        for item in explain:
+            plans.extend(_find_winning_plans(item))
+    return plans
+
+
+def _plan_stages(plan: dict) -> list[str]:
+    """Flatten the stage names of a plan tree"""
+    stages = [plan.get("stage")]
+    if "inputStage" in plan:
+        stages.extend(_plan_stages(plan["inputStage"]))
+    for child in plan.get("inputStages", []):
+        stages.extend(_plan_stages(child))
+    return [stage for stage in stages if stage]
+
+
+def explain_issues(explain: dict) -> list[str]:
+    """Return the bad stages found in an explain output"""
+    issues = []
+    for plan in _find_winning_plans(explain):
+        issues.extend(stage for stage in _plan_stages(plan) if stage in BAD_STAGES)
+    return issues
+
+
+def _query_shapes():
+    """(name, explain callable) for every model query shape"""
+    user_id = str(ObjectId())  # plans do not depend on the data
+
+    transaction_model = TransactionModel()
+    transaction_model.set_user_id(user_id)
+    category_model = CategoryModel()
+    category_model.set_user_id(user_id, provision=False)
+    user_model = UserModel()
+
+    now = datetime.now()
+    date_filters = {"start_date": now - timedelta(days=30), "end_date": now}
+    full_filters = {
+        **date_filters,
+        "transaction_type": "Expense",
+        "category": "Others",
+        "min_amount": 1,
+        "max_amount": 100,
+    }
+    trans_col = transaction_model.collection
+
+    def explain_find(collection, query, sort=None, projection=None):
+        cursor = collection.find(query, projection)
+        if sort:
+            cursor = cursor.sort(sort)
+        return lambda: cursor.explain()
+
+    def explain_aggregate(collection, pipeline):
+        return lambda: collection.database.command(
+            "explain",
+            {"aggregate": collection.name, "pipeline": pipeline, "cursor": {}},
+            verbosity="queryPlanner"
+        )
+
+    analyzer_match = transaction_model._build_query({**date_filters, "transaction_type": "Expense"})
+
+    return [
+        ("TransactionModel.get_transactions()",
+         explain_find(trans_col, transaction_model._build_query(None), [("created_at", -1)])),
+        ("TransactionModel.get_transactions(filters)",
+         explain_find(trans_col, transaction_model._build_query(full_filters), [("created_at", -1)])),
+        ("TransactionModel.get_transactions_page(dates)",
+         explain_find(trans_col, transaction_model._build_query(date_filters), [("date", -1), ("_id", -1)])),
+        ("TransactionModel.get_transactions(search_text)",
+         explain_find(trans_col, transaction_model._build_query({"search_text": "coffee shop"}),
+                      [("created_at", -1)])),
+        ("FinanceAnalyzer panels (covered)",
+         explain_aggregate(trans_col, [
+             {"$match": analyzer_match},
+             {"$group": {"_id": "$category", "total": {"$sum": "$amount"}}}
+         ])),
+        ("CategoryModel.delete_category_safe",
+         explain_find(trans_col, {"user_id": transaction_model.user_id, "category": "Others"})),
+        ("CategoryModel.get_categories_by_type",
+         explain_find(category_model.collection, {"user_id": category_model.user_id}, [("created_at", -1)])),
+        ("UserModel.login",
+         explain_find(user_model.collection, {"email": "someone@example.com"})),
+    ]
+
+
+def check_query_plans() -> dict[str, list[str]]:
+    """Explain every model query shape, return name -> bad stages"""
+    return {name: explain_issues(explain()) for name, explain in _query_shapes()}
+
+
+if __name__ == "__main__":
+    report = check_query_plans()
+    for name, issues in report.items():
+        status = "OK" if not issues else "FALLBACK: " + ", ".join(sorted(set(issues)))
+        print(f"{name:<50} {status}")
+
+    sys.exit(1 if any(report.values()) else 0)
@@ -0,0 +1,328 @@
+from database.database_manager import DatabaseManager
+import config
+from datetime import datetime, timedelta
+from typing import Optional, Iterable
+from bson.objectid import ObjectId
+from pymongo import UpdateOne, DeleteMany
+
+collection_name = config.COLLECTIONS['rollup']
+
+# fields of one rollup cell: (user_id, granularity, bucket, type, category)
+# -> sum/count/min/max of amount and first/last transaction date
+CELL_FIELDS = ["bucket", "type", "category", "sum", "count", "min", "max", "first_date", "last_date"]
+
+
+def truncate_date(value: datetime, granularity: str) -> datetime:
+    """Start of the day/month bucket containing `value`"""
+    if granularity == "month":
+        return datetime(value.year, value.month, 1)
+    return datetime(value.year, value.month, value.day)
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+class RollupModel:
+    """
+    Daily and monthly totals per (user, type, category).
+
+    Writes keep the cells up to date with $inc, readers combine whole
+    buckets with the raw transactions of the partial days at the edges.
+    After deletes, min/max/first_date/last_date are only bounds until the
+    next rebuild (sum and count stay exact).
+    """
+    GRANULARITIES = ("day", "month")
+
+    # user ids known to have complete rollups (in-process memo)
+    _ready_users: set = set()
+
+    def __init__(self):
+        self.db_manager = DatabaseManager()
+        self.collection = self.db_manager.get_collection(collection_name=collection_name)
+        self.transactions = self.db_manager.get_collection(config.COLLECTIONS['transaction'])
+        self.users = self.db_manager.get_collection(config.COLLECTIONS['user'])
+
+    # ======================================
+    # write path
+    # ======================================
+
+    @staticmethod
+    def transaction_cell(transaction: dict) -> dict:
+        """Cell holding a single transaction"""
+        amount = transaction['amount']
+        return {
+            "bucket": truncate_date(transaction['date'], "day"),
+            "type": transaction['type'],
+            "category": transaction['category'],
+            "sum": amount,
+            "count": 1,
+            "min": amount,
+            "max": amount,
+            "first_date": transaction['date'],
+            "last_date": transaction['date'],
+        }
+
+    def apply(
+        self,
+        user_id: ObjectId,
+        added: Iterable[dict] = (),
+        removed: Iterable[dict] = ()
+    ):
+        """
+        Add/remove day cells (see transaction_cell) to the user's rollups.
+
+        Cells are merged per (granularity, bucket, type, category) first,
+        so a bulk insert still costs a single bulk_write.
+        """
+        deltas = {}
+        for cells, sign in ((added, 1), (removed, -1)):
+            for cell in cells:
+                for granularity in self.GRANULARITIES:
+                    key = (granularity, truncate_date(cell['bucket'], granularity),
+                           cell['type'], cell['category'])
+                    delta = deltas.setdefault(key, {"sum": 0, "count": 0, "extremes": []})
+                    delta["sum"] += sign * cell['sum']
+                    delta["count"] += sign * cell['count']
+                    if sign > 0:
+                        delta["extremes"].append(cell)
+
+        if not deltas:
+            return
+
+        requests = []
+        emptied = [] # cells that lost transactions, they may now be empty
+        for (granularity, bucket, type_, category), delta in deltas.items():
+            update = {"$inc": {"sum": delta["sum"], "count": delta["count"]}}
+            if delta["extremes"]:
+                update["$min"] = {
+                    "min": min(cell['min'] for cell in delta["extremes"]),
+                    "first_date": min(cell['first_date'] for cell in delta["extremes"]),
+                }
+                update["$max"] = {
+                    "max": max(cell['max'] for cell in delta["extremes"]),
+                    "last_date": max(cell['last_date'] for cell in delta["extremes"]),
+                }
+            key = {"granularity": granularity, "bucket": bucket, "type": type_, "category": category}
+            requests.append(UpdateOne(
+                {"user_id": user_id, **key},
+                update,
+                upsert=bool(delta["extremes"])
+            ))
+            if delta["count"] < 0:
+                emptied.append(key)
+
+        # drop the touched cells that no longer hold any transaction
+        # (exact keys, so only those cells are read, not the whole history)
+        if emptied:
+            requests.append(DeleteMany({"user_id": user_id, "$or": emptied, "count": {"$lte": 0}}))
+
+        self.collection.bulk_write(requests, ordered=True)
+
+    def cells_for(self, user_id: ObjectId, query: dict) -> list[dict]:
+        """Day cells of the user's transactions matching `query`"""
+        return list(self.transactions.aggregate([
+            {"$match": {**query, "user_id": user_id}},
+            *self._cell_pipeline("day")
+        ]))
+
+    @staticmethod
+    def _cell_pipeline(granularity: str) -> list[dict]:
+        """Group raw transactions into cells of one granularity"""
+        return [
+            {"$group": {
+                "_id": {
+                    "bucket": {"$dateTrunc": {"date": "$date", "unit": granularity}},
+                    "type": "$type",
+                    "category": "$category"
+                },
+                "sum": {"$sum": "$amount"},
+                "count": {"$sum": 1},
+                "min": {"$min": "$amount"},
+                "max": {"$max": "$amount"},
+                "first_date": {"$min": "$date"},
+                "last_date": {"$max": "$date"}
+            }},
+            {"$project": {
+                "_id": 0,
+                "bucket": "$_id.bucket",
+                "type": "$_id.type",
+                "category": "$_id.category",
+                "sum": 1, "count": 1, "min": 1, "max": 1, "first_date": 1, "last_date": 1
+            }}
+        ]
+
+    def rebuild(self, user_id: Optional[ObjectId] = None):
+        """
+        Recompute rollups from the raw transactions (repair command).
+
+        Stop the app (or at least every writer) while it runs: a write
+        landing between the aggregation and its $merge is lost or counted
+        twice. The users are marked not ready first, so readers in this
+        process use the raw pipelines instead of half-built cells (other
+        processes keep their memo until they restart, one more reason to
+        stop them).
+
+        Args:
+            user_id: Only rebuild this user, None rebuilds every user
+        """
+        match = {"user_id": user_id} if user_id else {}
+        self.mark_not_ready(user_id)
+        self.collection.delete_many(match)
+
+        for granularity in self.GRANULARITIES:
+            self.transactions.aggregate([
+                {"$match": match},
+                {"$group": {
+                    "_id": {
+                        "user_id": "$user_id",
+                        "bucket": {"$dateTrunc": {"date": "$date", "unit": granularity}},
+                        "type": "$type",
+                        "category": "$category"
+                    },
+                    "sum": {"$sum": "$amount"},
+                    "count": {"$sum": 1},
+                    "min": {"$min": "$amount"},
+                    "max": {"$max": "$amount"},
+                    "first_date": {"$min": "$date"},
+                    "last_date": {"$max": "$date"}
+                }},
+                {"$project": {
+                    "_id": 0,
+                    "user_id": "$_id.user_id",
+                    "granularity": {"$literal": granularity},
+                    "bucket": "$_id.bucket",
+                    "type": "$_id.type",
+                    "category": "$_id.category",
+                    "sum": 1, "count": 1, "min": 1, "max": 1, "first_date": 1, "last_date": 1
+                }},
+                {"$merge": {
+                    "into": collection_name,
+                    "on": ["user_id", "granularity", "bucket", "type", "category"],
+                    "whenMatched": "replace",
+                    "whenNotMatched": "insert"
+                }}
+            ])
+
+        self.mark_ready(user_id)
+
+    def mark_ready(self, user_id: Optional[ObjectId] = None):
+        """Flag user(s) whose rollups cover their whole history"""
+        match = {"_id": user_id} if user_id else {}
+        self.users.update_many(match, {"$set": {"rollups_ready": True}})
+        if user_id:
+            RollupModel._ready_users.add(user_id)
+
+    def mark_not_ready(self, user_id: Optional[ObjectId] = None):
+        """
+        Send user(s) back to the raw pipelines (rollups missed a write or
+        are being rebuilt). Other processes drop their memo on restart,
+        until then they keep trusting the cells.
+        """
+        if user_id:
+            RollupModel._ready_users.discard(user_id)
+        else:
+            RollupModel._ready_users.clear()
+        match = {"_id": user_id} if user_id else {}
+        self.users.update_many(match, {"$unset": {"rollups_ready": ""}})
+
+    def is_ready(self, user_id: Optional[ObjectId]) -> bool:
+        """True if the user's rollups can replace raw transactions"""
+        if not user_id:
+            return False
+        if user_id in RollupModel._ready_users:
+            return True
+
+        ready = self.users.find_one({"_id": user_id, "rollups_ready": True}, {"_id": 1})
+        if ready:
+            RollupModel._ready_users.add(user_id)
+        return ready is not None
+
+    # ======================================
+    # read path
+    # ======================================
+
+    def get_cells(
+        self,
+        user_id: ObjectId,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> list[dict]:
+        """
+        Cells covering transactions with start_date <= date <= end_date.
+
+        Whole months come from month cells, remaining whole days from day
+        cells, and the partial days at both ends are grouped from the raw
+        transactions, all in one aggregation ($unionWith).
+
+        Returns:
+            list of cells (CELL_FIELDS); buckets of mixed granularity
+        """
+        rollup_ranges, raw_ranges = self._split_range(start_date, end_date)
+
+        pipeline = [
+            {"$match": {"user_id": user_id, "$or": rollup_ranges}} if rollup_ranges
+            else {"$match": {"_id": None}},  # nothing aligned to a bucket
+            {"$project": {"_id": 0, **{field: 1 for field in CELL_FIELDS}}}
+        ]
+
+        if raw_ranges:
+            pipeline.append({"$unionWith": {
+                "coll": config.COLLECTIONS['transaction'],
+                "pipeline": [
+                    {"$match": {"user_id": user_id, "$or": raw_ranges}},
+                    *self._cell_pipeline("day")
+                ]
+            }})
+
+        return list(self.collection.aggregate(pipeline))
+
+    @staticmethod
+    def _split_range(start_date: Optional[datetime], end_date: Optional[datetime]):
+        """
+        Split [start_date, end_date] into rollup bucket filters and raw
+        transaction filters for the partial days at the edges.
+        """
+        def bounds(field, low, high, high_inclusive=False):
+            condition = {}
+            if low is not None:
+                condition["$gte"] = low
+            if high is not None:
+                condition["$lte" if high_inclusive else "$lt"] = high
+            return {field: condition} if condition else {}
+
+        # whole days inside the range: [day_low, day_high)
+        day_low = start_date
+        if start_date is not None and start_date != truncate_date(start_date, "day"):
+            day_low = truncate_date(start_date, "day") + timedelta(days=1)
+        day_high = None
+        if end_date is not None:
+            # the last day counts only if end_date reaches its last millisecond
+            day_high = truncate_date(end_date + timedelta(milliseconds=1), "day")
+
+        if day_low is not None and day_high is not None and day_low >= day_high:
+            # no whole day in range, everything comes from raw transactions
+            return [], [bounds("date", start_date, end_date, high_inclusive=True)]
+
+        raw_ranges = []
+        if start_date is not None and day_low != start_date:
+            raw_ranges.append(bounds("date", start_date, day_low))
+        if end_date is not None and day_high <= end_date:
+            raw_ranges.append(bounds("date", day_high, end_date, high_inclusive=True))
+
+        # whole months inside the whole days: [month_low, month_high)
+        month_low = day_low
+        if day_low is not None and day_low != truncate_date(day_low, "month"):
+            month_low = _next_month(day_low)
+        month_high = truncate_date(day_high, "month") if day_high is not None else None
+
+        if month_low is not None and month_high is not None and month_low >= month_high:
+            rollup_ranges = [{"granularity": "day", **bounds("bucket", day_low, day_high)}]
+        else:
+            rollup_ranges = [{"granularity": "month", **bounds("bucket", month_low, month_high)}]
+            if day_low is not None and day_low != month_low:
+                rollup_ranges.append({"granularity": "day", **bounds("bucket", day_low, month_low)})
+            if day_high is not None and day_high != month_high:
+                rollup_ranges.append({"granularity": "day", **bounds("bucket", month_high, day_high)})
+
+        return rollup_ranges, raw_ranges
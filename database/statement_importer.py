@@ -0,0 +1,187 @@
+import csv
+import io
+import re
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Iterator, IO, Optional
+
+import config
+from utils import handler_datetime
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one statement import"""
+    inserted: int = 0
+    errors: list[tuple[int, str]] = field(default_factory=list) # (row number, message)
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+
+class StatementImporter:
+    """
+    Stream bank statements (CSV or OFX) into the current user's transactions.
+
+    Rows are parsed and validated chunk by chunk against a category set
+    fetched once, then written with one unordered insert_many per chunk.
+
+    CSV columns (header, case-insensitive): date, amount, and optionally
+    type, category, description. Without a type column, negative amounts
+    are expenses and positive amounts are income.
+    """
+
+    def __init__(self, transaction_model, category_model, chunk_size: int = config.IMPORT_CHUNK_SIZE):
+        self.transaction_model = transaction_model
+        self.category_model = category_model
+        self.chunk_size = chunk_size
+
+    # ======================================
+    # public entry points
+    # ======================================
+
+    def import_file(self, file: IO[bytes], filename: str) -> ImportReport:
+        """Import an uploaded file, the format is picked from its extension"""
+        extension = filename.rsplit(".", 1)[-1].lower()
+        if extension == "csv":
+            return self.import_csv(file)
+        if extension in ("ofx", "qfx"):
+            return self.import_ofx(file)
+        raise ValueError(f"Unsupported statement format: .{extension}")
+
+    def import_csv(self, file: IO[bytes]) -> ImportReport:
+        text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+        reader = csv.DictReader(text)
+        reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+
+        # row 1 is the header
+        rows = ((index, self._parse_csv_row(row)) for index, row in enumerate(reader, start=2))
+        return self._import_rows(rows)
+
+    def import_ofx(self, file: IO[bytes]) -> ImportReport:
+        text = io.TextIOWrapper(file, encoding="latin-1", newline="")
+        return self._import_rows(enumerate(self._parse_ofx(text), start=1))
+
+    # ======================================
+    # shared pipeline: validate + batch insert
+    # ======================================
+
+    def _import_rows(self, rows: Iterable[tuple[int, dict]]) -> ImportReport:
+        # one category lookup for the whole file
+        valid_categories = {
+            (cate["type"], cate["name"]) for cate in self.category_model.get_total()
+        }
+
+        report = ImportReport()
+        for chunk in self._chunks(rows):
+            batch, row_numbers = [], []
+            for row_number, row in chunk:
+                error = row.pop("_error", None) or self._validate(row, valid_categories)
+                if error:
+                    report.errors.append((row_number, error))
+                else:
+                    batch.append(row)
+                    row_numbers.append(row_number)
+
+            inserted, write_errors = self.transaction_model.insert_transactions(batch)
+            report.inserted += inserted
+            report.errors.extend((row_numbers[index], message) for index, message in write_errors.items())
+
+        report.errors.sort()
+        return report
+
+    def _chunks(self, rows: Iterable) -> Iterator[list]:
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= self.chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _validate(row: dict, valid_categories: set) -> Optional[str]:
+        if row["type"] not in config.TRANSACTION_TYPES:
+            return f"Unknown transaction type '{row['type']}'"
+        if row["amount"] <= 0:
+            return "Amount must be greater than zero"
+        if (row["type"], row["category"]) not in valid_categories:
+            return f"Category '{row['category']}' does not exist for {row['type']}"
+        return None
+
+    # ======================================
+    # CSV
+    # ======================================
+
+    def _parse_csv_row(self, row: dict) -> dict:
+        try:
+            amount = float(str(row.get("amount") or "").replace(",", ""))
+            transaction_date = self._parse_date(str(row.get("date") or ""))
+        except ValueError as e:
+            return {"_error": str(e)}
+
+        transaction_type = (row.get("type") or "").strip().capitalize()
+        if not transaction_type:
+            transaction_type = "Expense" if amount < 0 else "Income"
+
+        return {
+            "type": transaction_type,
+            "category": (row.get("category") or "").strip() or "Others",
+            "amount": abs(amount),
+            "date": transaction_date,
+            "description": (row.get("description") or "").strip(),
+        }
+
+    @staticmethod
+    def _parse_date(value: str) -> datetime:
+        value = value.strip()
+        try:
+            return handler_datetime(value)
+        except ValueError:
+            pass
+        for date_format in config.IMPORT_DATE_FORMATS:
+            try:
+                return datetime.strptime(value, date_format)
+            except ValueError:
+                continue
+        raise ValueError(f"Unrecognized date '{value}'")
+
+    # ======================================
+    # OFX (SGML or XML flavour)
+    # ======================================
+
+    _OFX_TAG = re.compile(r"<(/?)(\w+)>([^<\r\n]*)")
+
+    def _parse_ofx(self, lines: Iterable[str]) -> Iterator[dict]:
+        """Yield one row per <STMTTRN> block, reading the file line by line"""
+        current = None
+        for line in lines:
+            for closing, tag, value in self._OFX_TAG.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    if closing and current is not None:
+                        yield self._ofx_row(current)
+                        current = None
+                    elif not closing:
+                        current = {}
+                elif current is not None and not closing:
+                    current[tag] = value.strip()
+
+    def _ofx_row(self, fields: dict) -> dict:
+        try:
+            amount = float(fields.get("TRNAMT", ""))
+            # DTPOSTED looks like 20240105120000[-5:EST], keep the date part
+            transaction_date = datetime.strptime(fields.get("DTPOSTED", "")[:8], "%Y%m%d")
+        except ValueError:
+            return {"_error": f"Invalid OFX transaction {fields.get('FITID', '')}".strip()}
+
+        description = " ".join(filter(None, [fields.get("NAME"), fields.get("MEMO")]))
+        return {
+            "type": "Expense" if amount < 0 else "Income",
+            "category": "Others",
+            "amount": abs(amount),
+            "date": transaction_date,
+            "description": description,
+        }
@@ -0,0 +1,104 @@
+import csv
+import io
+from typing import IO, Iterable, Optional
+
+import pandas as pd
+
+import config
+
+# columns written to every export, in this order
+EXPORT_FIELDS = ["date", "type", "category", "amount", "description"]
+
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+class TransactionExporter:
+    """
+    Write the current user's transactions into a CSV or Parquet file.
+
+    Documents are read from a batched cursor and written batch by batch,
+    so no list of documents or DataFrame is built. The file itself is an
+    in-memory buffer (st.download_button keeps the whole file in its
+    media manager anyway): peak memory is the size of the export, which
+    is why the view refuses exports above config.EXPORT_MAX_ROWS.
+    """
+
+    def __init__(self, transaction_model, batch_size: int = config.EXPORT_BATCH_SIZE):
+        self.transaction_model = transaction_model
+        self.batch_size = batch_size
+
+    def export(self, export_format: str, advanced_filters: Optional[dict] = None) -> io.BytesIO:
+        """
+        Export transactions matching `advanced_filters`.
+
+        Args:
+            export_format: "CSV" or "Parquet" (keys of EXPORT_FORMATS)
+            advanced_filters: Same filter dict accepted by get_transactions
+
+        Returns:
+            BytesIO positioned at the start
+        """
+        batches = self.transaction_model.iter_transaction_batches(
+            advanced_filters=advanced_filters,
+            fields=EXPORT_FIELDS,
+            batch_size=self.batch_size
+        )
+
+        file = io.BytesIO()
+        if export_format == "CSV":
+            self._write_csv(file, batches)
+        elif export_format == "Parquet":
+            self._write_parquet(file, batches)
+        else:
+            raise ValueError(f"Unsupported export format: {export_format}")
+
+        file.seek(0)
+        return file
+
+    @staticmethod
+    def _write_csv(file: IO[bytes], batches: Iterable[list[dict]]):
+        text = io.TextIOWrapper(file, encoding="utf-8", newline="")
+        writer = csv.writer(text)
+        writer.writerow(EXPORT_FIELDS)
+        for batch in batches:
+            writer.writerows(
+                [doc.get(field, "") for field in EXPORT_FIELDS]
+                for doc in batch
+            )
+        text.flush()
+        text.detach()  # keep `file` open for the caller
+
+    @staticmethod
+    def _write_parquet(file: IO[bytes], batches: Iterable[list[dict]]):
+        # pyarrow ships with streamlit, only needed for this format
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("date", pa.timestamp("ms")),
+            ("type", pa.string()),
+            ("category", pa.string()),
+            ("amount", pa.float64()),
+            ("description", pa.string()),
+        ])
+
+        # one row group per cursor batch
+        with pq.ParquetWriter(file, schema) as writer:
+            for batch in batches:
+                columns = {field: [doc.get(field) for doc in batch] for field in EXPORT_FIELDS}
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+
+    @staticmethod
+    def export_frame(df: pd.DataFrame, export_format: str) -> bytes:
+        """Serialize a small analytics table (category spending, trend...)"""
+        keep_index = not isinstance(df.index, pd.RangeIndex) # e.g. the trend's month index
+        if export_format == "CSV":
+            return df.to_csv(index=keep_index).encode("utf-8")
+        if export_format == "Parquet":
+            buffer = io.BytesIO()
+            df.to_parquet(buffer, index=keep_index)
+            return buffer.getvalue()
+        raise ValueError(f"Unsupported export format: {export_format}")
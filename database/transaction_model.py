@@ -1,35 +1,409 @@
 from database.category_model import CategoryModel
-from typing import Optional, Any
+from database.rollup_model import RollupModel
+from database.budget_model import BudgetModel
+from typing import Optional, Any, Iterator
+import copy
+import logging
+import re
+import unicodedata
 from datetime import datetime, date
 from bson.objectid import ObjectId
 from .database_manager import DatabaseManager
 import config
-from pymongo import DESCENDING, ASCENDING
+from pymongo import DESCENDING, ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
 from utils import handler_datetime
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger("finance_tracker.rollups")
+
+
+def tokenize_text(text: Optional[str]) -> list[str]:
+    """
+    Normalize free text into unique search keywords.
+
+    Lowercases, strips accents and splits on anything that is not a
+    letter or digit, e.g. "Café Latte x2" -> ["cafe", "latte", "x2"].
+    """
+    if not text:
+        return []
+    normalized = unicodedata.normalize("NFKD", text)
+    normalized = "".join(ch for ch in normalized if not unicodedata.combining(ch)).lower()
+    return list(dict.fromkeys(re.findall(r"\w+", normalized)))
 
 
 class TransactionModel:
 
+    # the only fields the analytics need
+    ANALYSIS_FIELDS = ["type", "amount", "date", "category"]
+
+    # columns of the transaction table
+    LIST_FIELDS = ["date", "type", "category", "amount", "description"]
+
+    # fields the user can change on an existing transaction
+    EDITABLE_FIELDS = ["type", "category", "amount", "date", "description"]
+
+    # fields that move a transaction between rollup cells
+    ROLLUP_FIELDS = ["type", "amount", "date", "category"]
+
     def __init__(self, user_id: Optional[str] = None):
         self.db_manager = DatabaseManager()
         self.collection = self.db_manager.get_collection(config.COLLECTIONS["transaction"])
         self.user_id = user_id
 
+        # used to validate categories on write, provisioning is done at login
+        self.category_model = CategoryModel(user_id)
+
+        # daily/monthly totals and budget alerts kept in sync on every write
+        self.rollup_model = RollupModel()
+        self.budget_model = BudgetModel()
+
+    def for_user(self, user_id: str) -> "TransactionModel":
+        """
+        Handle scoped to one user, e.g. one per Streamlit session.
+
+        Collections, caches and the client pool stay shared with this model,
+        only the user id (and the category handle) belong to the copy.
+        """
+        scoped = copy.copy(self)
+        scoped.category_model = self.category_model.for_user(user_id, provision=False)
+        scoped.user_id = ObjectId(user_id) if user_id is not None else None
+        return scoped
+
     def set_user_id(self, user_id: Optional[str]):
         """Set or clear the current user id used to scope queries."""
         self.user_id = ObjectId(user_id) if user_id is not None else None
+        self.category_model.set_user_id(user_id, provision=False)
     
     def get_transactions(
         self,
-        advanced_filters: dict[str, any] = None
+        advanced_filters: dict[str, any] = None,
+        fields: Optional[list[str]] = None
     ) -> list[dict]:
 
         # Build query filter
         query = self._build_query(advanced_filters)
               
         # Fetch transactions, sort from newest to oldest
-        cursor = self.collection.find(query).sort("created_at", -1)
+        cursor = self.collection.find(query, self._projection(fields)).sort("created_at", -1)
         return list(cursor)     
+
+    @staticmethod
+    def _projection(fields: Optional[list[str]]) -> Optional[dict]:
+        """Build a find() projection, None returns the full documents"""
+        if not fields:
+            return None
+        return {field: 1 for field in fields}
+
+    def get_transactions_frame(
+        self,
+        advanced_filters: Optional[dict[str, Any]] = None,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 1000
+    ) -> pd.DataFrame:
+        """
+        Load transactions straight into typed DataFrame columns.
+
+        Documents are consumed batch by batch from the cursor and appended
+        to per-field columns, so no list of dicts is ever materialized.
+        `type` and `category` become categoricals, `date` datetime64 and
+        `amount` float64.
+
+        Args:
+            advanced_filters: Same filter dict accepted by get_transactions
+            fields: Columns to load, defaults to ANALYSIS_FIELDS
+            batch_size: Documents per cursor batch
+
+        Returns:
+            DataFrame with one column per field (empty if no transactions)
+        """
+        fields = list(fields or self.ANALYSIS_FIELDS)
+        query = self._build_query(advanced_filters)
+        cursor = (
+            self.collection.find(query, self._projection(fields))
+            .sort("created_at", -1)
+            .batch_size(batch_size)
+        )
+
+        columns = {field: [] for field in fields}
+        for doc in cursor:
+            for field, values in columns.items():
+                values.append(doc.get(field))
+
+        if not columns[fields[0]]:
+            return pd.DataFrame()
+
+        return pd.DataFrame({
+            field: self._to_typed_column(field, values)
+            for field, values in columns.items()
+        })
+
+    def count_transactions(self, advanced_filters: Optional[dict[str, Any]] = None) -> int:
+        """Number of transactions matching the filters"""
+        return self.collection.count_documents(self._build_query(advanced_filters))
+
+    def get_date_bounds(
+        self,
+        advanced_filters: Optional[dict[str, Any]] = None
+    ) -> tuple[Optional[datetime], Optional[datetime]]:
+        """
+        (first, last) transaction date matching the filters, (None, None)
+        when nothing matches. Two indexed find_one on (user_id, date).
+        """
+        query = self._build_query(advanced_filters)
+        bounds = [
+            self.collection.find_one(query, {'date': 1, '_id': 0}, sort=[('date', direction)])
+            for direction in (ASCENDING, DESCENDING)
+        ]
+        if bounds[0] is None:
+            return None, None
+        return bounds[0]['date'], bounds[1]['date']
+
+    def iter_transaction_batches(
+        self,
+        advanced_filters: Optional[dict[str, Any]] = None,
+        fields: Optional[list[str]] = None,
+        batch_size: int = 1000
+    ) -> Iterator[list[dict]]:
+        """
+        Yield transactions in batches, oldest first, without loading them all.
+
+        Args:
+            advanced_filters: Same filter dict accepted by get_transactions
+            fields: Fields to return, None returns full documents
+            batch_size: Documents per batch (and per cursor round trip)
+
+        Yields:
+            lists of at most `batch_size` transaction documents
+        """
+        query = self._build_query(advanced_filters)
+        cursor = (
+            self.collection.find(query, self._projection(fields))
+            .sort([("date", ASCENDING), ("_id", ASCENDING)])
+            .batch_size(batch_size)
+        )
+
+        batch = []
+        for doc in cursor:
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _to_typed_column(field: str, values: list):
+        """Convert one raw column to its numpy/pandas dtype"""
+        if field == "amount":
+            return np.asarray(values, dtype="float64")
+        if field in ("date", "created_at", "last_modified"):
+            return np.asarray(values, dtype="datetime64[ms]")
+        if field == "type":
+            return pd.Categorical(values, categories=config.TRANSACTION_TYPES)
+        if field == "category":
+            return pd.Categorical(values)
+        return values
+
+    def get_transactions_page(
+        self,
+        advanced_filters: Optional[dict[str, Any]] = None,
+        page_size: int = config.TRANSACTION_PAGE_SIZE,
+        after: Optional[dict] = None,
+        fields: Optional[list[str]] = None
+    ) -> tuple[list[dict], Optional[dict]]:
+        """
+        Fetch one page of transactions with keyset pagination.
+
+        Pages are ordered by (date, _id) from newest to oldest, so the page
+        boundary is stable even when several transactions share a date.
+
+        Args:
+            advanced_filters: Same filter dict accepted by get_transactions
+            page_size: Number of transactions per page
+            after: Cursor returned by the previous page, None for the first page
+            fields: Fields to return (plus _id), None returns full documents
+
+        Returns:
+            (transactions, next cursor), the cursor is None on the last page
+        """
+        query = self._build_query(advanced_filters)
+
+        # continue strictly after the last (date, _id) we handed out
+        if after:
+            query["$and"].append({
+                "$or": [
+                    {"date": {"$lt": after["date"]}},
+                    {"date": after["date"], "_id": {"$lt": after["_id"]}}
+                ]
+            })
+
+        # fetch one extra document to know if there is another page
+        cursor = (
+            # the cursor needs the date of the last row, keep it in the projection
+            self.collection.find(query, self._projection(fields and [*fields, "date"]))
+            .sort([("date", DESCENDING), ("_id", DESCENDING)])
+            .limit(page_size + 1)
+        )
+        transactions = list(cursor)
+
+        if len(transactions) <= page_size:
+            return transactions, None
+
+        transactions = transactions[:page_size]
+        last = transactions[-1]
+        return transactions, {"date": last["date"], "_id": last["_id"]}
+
+    def get_transactions_page_frame(
+        self,
+        advanced_filters: Optional[dict[str, Any]] = None,
+        page_size: int = config.TRANSACTION_TABLE_PAGE_SIZE,
+        after: Optional[dict] = None,
+        fields: Optional[list[str]] = None
+    ) -> tuple[pd.DataFrame, Optional[dict]]:
+        """
+        One keyset page (see get_transactions_page) as typed DataFrame columns.
+
+        Args:
+            advanced_filters: Same filter dict accepted by get_transactions
+            page_size: Number of transactions per page
+            after: Cursor returned by the previous page, None for the first page
+            fields: Columns besides `_id`, defaults to LIST_FIELDS
+
+        Returns:
+            (DataFrame with an `_id` string column, next cursor or None)
+        """
+        fields = list(fields or self.LIST_FIELDS)
+        transactions, cursor = self.get_transactions_page(advanced_filters, page_size, after, fields)
+
+        frame = pd.DataFrame({
+            "_id": [str(doc["_id"]) for doc in transactions],
+            **{
+                field: self._to_typed_column(field, [doc.get(field) for doc in transactions])
+                for field in fields
+            }
+        })
+        return frame, cursor
+
+    def search_transactions(
+        self,
+        search_text: str,
+        advanced_filters: Optional[dict[str, Any]] = None,
+        page_size: int = config.TRANSACTION_PAGE_SIZE,
+        after: Optional[dict] = None
+    ) -> tuple[list[dict], Optional[dict]]:
+        """
+        Search descriptions by keyword prefix, best matches first.
+
+        A transaction matches when any of its keywords starts with any
+        search token; results are ranked by how many tokens matched,
+        then by date. Pages use the same keyset pagination as
+        get_transactions_page, on (score, date, _id).
+
+        Args:
+            search_text: Free text typed by the user (never used as a regex)
+            advanced_filters: Extra filters, same dict as get_transactions
+            page_size: Number of results per page
+            after: Cursor returned by the previous page, None for the first page
+
+        Returns:
+            (transaction documents with a `score` field, next cursor), the
+            cursor is None on the last page
+        """
+        tokens = tokenize_text(search_text)
+        if not tokens:
+            return [], None
+
+        filters = {k: v for k, v in (advanced_filters or {}).items() if k != "search_text"}
+        prefixes = [f"^{re.escape(token)}" for token in tokens]
+
+        score = {"$add": [
+            {"$cond": [
+                {"$anyElementTrue": [{"$map": {
+                    "input": {"$ifNull": ["$keywords", []]},
+                    "in": {"$regexMatch": {"input": "$$this", "regex": prefix}}
+                }}]},
+                1,
+                0
+            ]}
+            for prefix in prefixes
+        ]}
+
+        pipeline = [
+            {"$match": {"keywords": {"$in": [re.compile(prefix) for prefix in prefixes]}}},
+            {"$addFields": {"score": score}}
+        ]
+        # continue strictly after the last (score, date, _id) we handed out
+        if after:
+            pipeline.append({"$match": {"$or": [
+                {"score": {"$lt": after["score"]}},
+                {"score": after["score"], "date": {"$lt": after["date"]}},
+                {"score": after["score"], "date": after["date"], "_id": {"$lt": after["_id"]}}
+            ]}})
+
+        # fetch one extra document to know if there is another page
+        transactions = self.aggregate(
+            [
+                *pipeline,
+                {"$sort": {"score": -1, "date": -1, "_id": -1}},
+                {"$limit": page_size + 1}
+            ],
+            filters
+        )
+
+        if len(transactions) <= page_size:
+            return transactions, None
+
+        transactions = transactions[:page_size]
+        last = transactions[-1]
+        return transactions, {"score": last["score"], "date": last["date"], "_id": last["_id"]}
+
+    def aggregate(
+        self,
+        pipeline: list[dict],
+        advanced_filters: Optional[dict[str, Any]] = None
+    ) -> list[dict]:
+        """
+        Run an aggregation pipeline over the current user's transactions.
+
+        The user constraint (and any advanced filters) is always applied
+        as the first $match stage, so callers only describe the grouping.
+
+        Args:
+            pipeline: Stages to run after the $match stage
+            advanced_filters: Same filter dict accepted by get_transactions
+
+        Returns:
+            list of result documents
+        """
+        query = self._build_query(advanced_filters)
+        return list(self.collection.aggregate([{"$match": query}, *pipeline]))
+
+    def aggregate_facets(
+        self,
+        facets: dict[str, tuple[Optional[dict[str, Any]], list[dict]]]
+    ) -> dict[str, list[dict]]:
+        """
+        Run several independent pipelines in one round trip with $facet.
+
+        Args:
+            facets: name -> (advanced_filters, pipeline) pairs; each branch
+                gets its own $match built from its filters
+
+        Returns:
+            name -> list of result documents
+        """
+        facet_stage = {
+            name: [{"$match": self._build_query(filters)}, *pipeline]
+            for name, (filters, pipeline) in facets.items()
+        }
+        # the outer $match uses the user index, branches only narrow it down
+        result = list(self.collection.aggregate([
+            {"$match": self._build_query(None)},
+            {"$facet": facet_stage}
+        ]))
+        return result[0] if result else {name: [] for name in facets}
     
     def _build_query(self, advanced_filter: Optional[dict]) -> dict:
         conditions = []
@@ -68,14 +442,12 @@ class TransactionModel:
                 date_query["$lte"] = handler_datetime(end_date) # $lte = less than or equal
             conditions.append({"date": date_query})
 
-        # Check description:
-        if "search_text" in advanced_filter:
-            conditions.append({
-                "description": {
-                    "$regex": advanced_filter.get("search_text"),
-                    "$options": "i"  # case-insensitive
-                }
-            })
+        # Check description (keyword prefix match, served by the keywords index):
+        if advanced_filter.get("search_text"):
+            conditions.extend(
+                {"keywords": {"$regex": f"^{re.escape(token)}"}}
+                for token in tokenize_text(advanced_filter["search_text"])
+            )
 
         return self._add_user_constraint(conditions)
     
@@ -108,30 +480,141 @@ class TransactionModel:
         Returns:
             Inserted document ID as string, or None if failed
         """
-        cate_model = CategoryModel()
-        cate_model.set_user_id(str(self.user_id))
-        if not cate_model.category_exists(category_name=category, category_type=transaction_type):
+        if not self.category_model.category_exists(category_name=category, category_type=transaction_type):
             raise ValueError("Invalid category. Category does not exist.")
+
+        transaction = self._build_document(
+            transaction_type, category, amount, transaction_date, description
+        )
+
+        try:
+            result = self.collection.insert_one(transaction)
+        except Exception as e:
+            print(f"Error adding transaction: {e}")
+            return None
+
+        # the transaction is saved whatever happens to the side effects
+        self._after_write(added=[transaction])
+        return str(result.inserted_id)
+
+    def _build_document(
+        self,
+        transaction_type: str,
+        category: str,
+        amount: float,
+        transaction_date: datetime | date | str,
+        description: str = ""
+    ) -> dict:
+        """Build a transaction document for the current user (no validation)"""
         if not isinstance(transaction_date, datetime):
             transaction_date = handler_datetime(transaction_date)
 
-        transaction = {
+        return {
             'type': transaction_type,
             'category': category,
             'amount': amount,
             'date': transaction_date,
             'description': description,
+            'keywords': tokenize_text(description),
             'created_at': datetime.now(),
             'last_modified': datetime.now(),
             'user_id': self.user_id ## added user_id field
         }
 
+    def _after_write(self, added: list[dict] = (), removed: list[dict] = ()):
+        """
+        Update the rollup cells and budget alerts touched by a write.
+
+        Never raises: the write itself already happened, so a failure here
+        must not be reported as a failed write (the user would retry and
+        create a duplicate). If the rollups cannot be updated the user is
+        marked not ready, reads then use the raw pipelines until
+        `python -m database.maintenance rebuild-rollups` runs.
+        """
         try:
-            result = self.collection.insert_one(transaction)
-            return str(result.inserted_id)
-        except Exception as e:
-            print(f"Error adding transaction: {e}")
-            return None
+            self.rollup_model.apply(
+                self.user_id,
+                added=[RollupModel.transaction_cell(doc) for doc in added],
+                removed=[RollupModel.transaction_cell(doc) for doc in removed]
+            )
+        except Exception:
+            logger.exception("rollup update failed for user %s, falling back to raw pipelines", self.user_id)
+            self.rollup_model.mark_not_ready(self.user_id)
+
+        self._refresh_alerts([*added, *removed])
+
+    def _refresh_alerts(self, documents: list[dict]):
+        """Re-check the budget alerts of the expense categories in `documents`"""
+        expenses = [doc for doc in documents if doc['type'] == "Expense"]
+        if expenses:
+            try:
+                self.budget_model.refresh_alerts(
+                    self.user_id,
+                    categories={doc['category'] for doc in expenses},
+                    dates=[doc['date'] for doc in expenses]
+                )
+            except Exception:
+                # alerts are re-checked on the next write to the category
+                logger.exception("budget alert refresh failed for user %s", self.user_id)
+
+    def validate_transactions(self, transactions: list[dict]) -> dict[int, str]:
+        """
+        Check many rows against one category lookup (no query per row).
+
+        Args:
+            transactions: dicts with type, category, amount and date
+
+        Returns:
+            {index in `transactions`: error message}, empty if all valid
+        """
+        valid_categories = {
+            (cate['type'], cate['name']) for cate in self.category_model.get_total()
+        }
+
+        errors = {}
+        for index, item in enumerate(transactions):
+            if item.get('type') not in config.TRANSACTION_TYPES:
+                errors[index] = f"Unknown transaction type '{item.get('type')}'"
+            elif not item.get('amount') or item['amount'] <= 0:
+                errors[index] = "Amount must be greater than zero"
+            elif not item.get('date'):
+                errors[index] = "Date is required"
+            elif (item['type'], item.get('category')) not in valid_categories:
+                errors[index] = f"Category '{item.get('category')}' does not exist for {item['type']}"
+        return errors
+
+    def insert_transactions(self, transactions: list[dict]) -> tuple[int, dict[int, str]]:
+        """
+        Insert already validated transactions with one unordered insert_many.
+
+        Args:
+            transactions: dicts with type, category, amount, date and
+                optional description
+
+        Returns:
+            (inserted count, {index in `transactions`: error message})
+        """
+        if not transactions:
+            return 0, {}
+
+        documents = [
+            self._build_document(
+                item['type'], item['category'], item['amount'], item['date'],
+                item.get('description', "")
+            )
+            for item in transactions
+        ]
+
+        errors = {}
+        try:
+            # ordered=False: one bad document does not stop the rest of the batch
+            self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            errors = {err['index']: err.get('errmsg', "write error") for err in e.details.get('writeErrors', [])}
+
+        inserted = [doc for index, doc in enumerate(documents) if index not in errors]
+        self._after_write(added=inserted)
+        return len(inserted), errors
     
     def update_transaction(
         self,
@@ -150,23 +633,35 @@ class TransactionModel:
         """
         try:
             if "category" in kwargs:
-                cate_model = CategoryModel()
-                cate_model.set_user_id(str(self.user_id))
-                if not cate_model.category_exists(
+                if not self.category_model.category_exists(
                     category_name=kwargs["category"]
                 ):
                     raise ValueError("Invalid category. Category does not exist.")
 
+            # keep the search keywords in sync with the description
+            if "description" in kwargs:
+                kwargs['keywords'] = tokenize_text(kwargs['description'])
+
             # Add last_modified timestamp
             kwargs['last_modified'] = datetime.now()
             # Build filter and scope by user if available
             filter_ = {'_id': ObjectId(transaction_id),
                        'user_id': self.user_id} # added user_id constraint
-            result = self.collection.update_one(filter_, {'$set': kwargs})
-            return result.modified_count > 0
+            # get the previous version back to move its amount between rollup cells
+            previous = self.collection.find_one_and_update(
+                filter_,
+                {'$set': kwargs},
+                return_document=ReturnDocument.BEFORE
+            )
         except Exception as e:
             print(f"Error updating transaction: {e}")
             return False
+
+        if previous is None:
+            return False
+        if any(field in kwargs for field in self.ROLLUP_FIELDS):
+            self._after_write(added=[{**previous, **kwargs}], removed=[previous])
+        return True
     
     def delete_transaction(self, transaction_id: str) -> bool:
         """
@@ -182,12 +677,164 @@ class TransactionModel:
             filter_ = {'_id': ObjectId(transaction_id),
                        'user_id': self.user_id} # added user_id constraint
             
-            result = self.collection.delete_one(filter_)
-            return result.deleted_count > 0
+            deleted = self.collection.find_one_and_delete(filter_)
         except Exception as e:
             print(f"Error deleting transaction: {e}")
             return False
+
+        if deleted is None:
+            return False
+        self._after_write(removed=[deleted])
+        return True
     
+    def update_transactions(self, changes: dict[str, dict]) -> tuple[int, dict[str, str]]:
+        """
+        Apply many per-transaction edits with one bulk_write.
+
+        The current documents are read in one query, the edited versions
+        validated against one category lookup, then every valid edit is
+        written with a single unordered bulk_write and the rollups moved
+        in one batch.
+
+        Each update only matches while the rollup fields still hold the
+        values read here, so a transaction changed concurrently is left
+        alone and reported instead of moving the rollups by a wrong delta
+        (same guarantee as update_transaction's find_one_and_update).
+
+        Args:
+            changes: {transaction id: {field: new value}}, only EDITABLE_FIELDS are applied
+
+        Returns:
+            (updated count, {transaction id: error message})
+        """
+        changes = {
+            transaction_id: {field: value for field, value in fields.items() if field in self.EDITABLE_FIELDS}
+            for transaction_id, fields in changes.items()
+        }
+        errors = {transaction_id: "Nothing to update" for transaction_id, fields in changes.items() if not fields}
+        changes = {transaction_id: fields for transaction_id, fields in changes.items() if fields}
+        if not changes:
+            return 0, errors
+
+        previous = {
+            str(doc['_id']): doc
+            for doc in self.collection.find({
+                '_id': {'$in': [ObjectId(transaction_id) for transaction_id in changes]},
+                'user_id': self.user_id
+            })
+        }
+        errors.update({
+            transaction_id: "Transaction not found"
+            for transaction_id in changes if transaction_id not in previous
+        })
+
+        edited = [
+            (transaction_id, {**previous[transaction_id], **fields})
+            for transaction_id, fields in changes.items() if transaction_id in previous
+        ]
+        invalid = self.validate_transactions([doc for _, doc in edited])
+        errors.update({edited[index][0]: message for index, message in invalid.items()})
+        edited = [item for index, item in enumerate(edited) if index not in invalid]
+        if not edited:
+            return 0, errors
+
+        # BSON dates keep milliseconds, the stamp must compare equal once stored
+        now = datetime.now()
+        now = now.replace(microsecond=now.microsecond // 1000 * 1000)
+        requests = []
+        for transaction_id, _ in edited:
+            fields = dict(changes[transaction_id])
+            # keep the search keywords in sync with the description
+            if 'description' in fields:
+                fields['keywords'] = tokenize_text(fields['description'])
+            fields['last_modified'] = now
+            requests.append(UpdateOne(
+                {'_id': ObjectId(transaction_id), 'user_id': self.user_id,
+                 **{field: previous[transaction_id].get(field) for field in self.ROLLUP_FIELDS}},
+                {'$set': fields}
+            ))
+
+        failed = {}
+        try:
+            result = self.collection.bulk_write(requests, ordered=False)
+            matched = result.matched_count
+        except BulkWriteError as e:
+            failed = {
+                edited[err['index']][0]: err.get('errmsg', "write error")
+                for err in e.details.get('writeErrors', [])
+            }
+            matched = e.details.get('nMatched', 0)
+
+        if matched < len(edited) - len(failed):
+            # some filters did not match: only the documents carrying this
+            # write's stamp were updated by it
+            stamped = {
+                str(doc['_id'])
+                for doc in self.collection.find(
+                    {'_id': {'$in': [ObjectId(transaction_id) for transaction_id, _ in edited]},
+                     'user_id': self.user_id, 'last_modified': now},
+                    {'_id': 1}
+                )
+            }
+            failed.update({
+                transaction_id: "Changed by another edit, reload and try again"
+                for transaction_id, _ in edited
+                if transaction_id not in stamped and transaction_id not in failed
+            })
+
+        errors.update(failed)
+        edited = [(transaction_id, doc) for transaction_id, doc in edited if transaction_id not in failed]
+
+        moved = [
+            (transaction_id, doc) for transaction_id, doc in edited
+            if any(field in changes[transaction_id] for field in self.ROLLUP_FIELDS)
+        ]
+        if moved:
+            self._after_write(
+                added=[doc for _, doc in moved],
+                removed=[previous[transaction_id] for transaction_id, _ in moved]
+            )
+        return len(edited), errors
+
+    def delete_transactions(self, transaction_ids: list[str]) -> int:
+        """
+        Delete many transactions of the current user with one delete_many.
+
+        Only rows still holding the rollup fields read here are deleted. If
+        fewer rows than read were deleted (a concurrent edit or delete), the
+        rows actually removed are unknown, so the user's rollups are marked
+        not ready instead of being moved by a possibly wrong delta.
+
+        Returns:
+            number of deleted transactions
+        """
+        query = {
+            '_id': {'$in': [ObjectId(transaction_id) for transaction_id in transaction_ids]},
+            'user_id': self.user_id
+        }
+        # the rollups need what is being removed
+        documents = list(self.collection.find(query, {field: 1 for field in self.ROLLUP_FIELDS}))
+        if not documents:
+            return 0
+
+        result = self.collection.delete_many({
+            'user_id': self.user_id,
+            '$or': [
+                {'_id': doc['_id'], **{field: doc.get(field) for field in self.ROLLUP_FIELDS}}
+                for doc in documents
+            ]
+        })
+        if result.deleted_count == len(documents):
+            self._after_write(removed=documents)
+        else:
+            logger.warning(
+                "%d of %d transactions changed while deleting for user %s, falling back to raw pipelines",
+                len(documents) - result.deleted_count, len(documents), self.user_id
+            )
+            self.rollup_model.mark_not_ready(self.user_id)
+            self._refresh_alerts(documents)
+        return result.deleted_count
+
     def get_transaction_by_id(self, transaction_id: str) -> Optional[dict]:
         """
         Get a single transaction by ID.
@@ -17,7 +17,8 @@ class UserModel:
             "email": email,
             "created_at": datetime.now(),
             "last_modified": datetime.now(),
-            "is_activate": True
+            "is_activate": True,
+            "rollups_ready": True # no history yet, rollups are complete from day one
         }
 
         result = self.collection.insert_one(user)
@@ -75,11 +76,15 @@ class UserModel:
         cate_col = self.db_manager.get_collection(
             config.COLLECTIONS["category"]
         )
+        rollup_col = self.db_manager.get_collection(
+            config.COLLECTIONS["rollup"]
+        )
 
         # delete related data
         trans_result = trans_col.delete_many({"user_id": user_oid})
         budget_result = budget_col.delete_many({"user_id": user_oid})
         cate_result = cate_col.delete_many({"user_id": user_oid})
+        rollup_col.delete_many({"user_id": user_oid})
 
         # delete user
         user_result = self.collection.delete_one({"_id": user_oid})
@@ -0,0 +1,189 @@
+"""
+RollupModel pure parts: range splitting and delta merging (no MongoDB needed).
+
+run: python -m pytest tests
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from bson.objectid import ObjectId
+from pymongo import UpdateOne, DeleteMany
+
+from database.rollup_model import RollupModel, truncate_date
+
+
+# ======================================
+# _split_range
+# ======================================
+
+def _matches(condition: dict, value) -> bool:
+    """Evaluate a {field: {$gte/$lt/$lte: bound}} condition on one value"""
+    return (
+        ("$gte" not in condition or value >= condition["$gte"])
+        and ("$lt" not in condition or value < condition["$lt"])
+        and ("$lte" not in condition or value <= condition["$lte"])
+    )
+
+
+def _coverage(rollup_ranges: list[dict], raw_ranges: list[dict], value: datetime) -> int:
+    """How many of the split filters count a transaction dated `value`"""
+    covered = sum(_matches(raw.get("date", {}), value) for raw in raw_ranges)
+    for rollup in rollup_ranges:
+        bucket = truncate_date(value, rollup["granularity"])
+        covered += _matches(rollup.get("bucket", {}), bucket)
+    return covered
+
+
+def _random_date(rng: random.Random) -> datetime:
+    """Dates around a few month ends, often exactly on a day/month boundary"""
+    base = datetime(2024, 1, 1) + timedelta(days=rng.randrange(0, 120))
+    return rng.choice([
+        base,
+        base.replace(day=1),
+        base + timedelta(milliseconds=rng.randrange(0, 86_400_000)),
+        base - timedelta(milliseconds=1),
+        base + timedelta(days=1) - timedelta(milliseconds=1),
+    ])
+
+
+def test_split_range_counts_every_transaction_once_brute_force():
+    rng = random.Random(20240101)
+    for _ in range(2000):
+        start_date = _random_date(rng) if rng.random() > 0.1 else None
+        end_date = _random_date(rng) if rng.random() > 0.1 else None
+        rollup_ranges, raw_ranges = RollupModel._split_range(start_date, end_date)
+
+        for _ in range(30):
+            value = _random_date(rng)
+            expected = int(
+                (start_date is None or value >= start_date)
+                and (end_date is None or value <= end_date)
+            )
+            assert _coverage(rollup_ranges, raw_ranges, value) == expected, (start_date, end_date, value)
+
+
+def test_split_range_whole_months_use_month_cells():
+    rollup_ranges, raw_ranges = RollupModel._split_range(
+        datetime(2024, 1, 1), datetime(2024, 3, 31, 23, 59, 59, 999000)
+    )
+    assert raw_ranges == []
+    assert rollup_ranges == [
+        {"granularity": "month", "bucket": {"$gte": datetime(2024, 1, 1), "$lt": datetime(2024, 4, 1)}}
+    ]
+
+
+def test_split_range_partial_days_come_from_raw_transactions():
+    rollup_ranges, raw_ranges = RollupModel._split_range(
+        datetime(2024, 1, 10, 12), datetime(2024, 1, 12, 6)
+    )
+    assert rollup_ranges == [
+        {"granularity": "day", "bucket": {"$gte": datetime(2024, 1, 11), "$lt": datetime(2024, 1, 12)}}
+    ]
+    assert raw_ranges == [
+        {"date": {"$gte": datetime(2024, 1, 10, 12), "$lt": datetime(2024, 1, 11)}},
+        {"date": {"$gte": datetime(2024, 1, 12), "$lte": datetime(2024, 1, 12, 6)}},
+    ]
+
+
+def test_split_range_within_one_day_is_all_raw():
+    start_date, end_date = datetime(2024, 1, 10, 8), datetime(2024, 1, 10, 20)
+    assert RollupModel._split_range(start_date, end_date) == (
+        [], [{"date": {"$gte": start_date, "$lte": end_date}}]
+    )
+
+
+def test_split_range_unbounded():
+    assert RollupModel._split_range(None, None) == ([{"granularity": "month"}], [])
+
+
+# ======================================
+# apply (delta merging)
+# ======================================
+
+class _RecordingCollection:
+    """Keeps the bulk_write requests instead of sending them"""
+
+    def __init__(self):
+        self.requests = None
+
+    def bulk_write(self, requests, ordered=True):
+        self.requests = requests
+
+
+@pytest.fixture
+def rollup_model():
+    # skip __init__, only the rollup collection is used by apply
+    model = RollupModel.__new__(RollupModel)
+    model.collection = _RecordingCollection()
+    return model
+
+
+def _transaction(amount: float, date: datetime, category: str = "Food") -> dict:
+    return {"type": "Expense", "category": category, "amount": amount, "date": date}
+
+
+def _key(granularity: str, bucket: datetime, category: str = "Food") -> dict:
+    return {"granularity": granularity, "bucket": bucket, "type": "Expense", "category": category}
+
+
+def test_apply_merges_cells_of_the_same_bucket(rollup_model):
+    user_id = ObjectId()
+    first = datetime(2024, 1, 10, 9)
+    second = datetime(2024, 1, 10, 18)
+    rollup_model.apply(user_id, added=[
+        RollupModel.transaction_cell(_transaction(5.0, first)),
+        RollupModel.transaction_cell(_transaction(20.0, second)),
+    ])
+
+    update = {
+        "$inc": {"sum": 25.0, "count": 2},
+        "$min": {"min": 5.0, "first_date": first},
+        "$max": {"max": 20.0, "last_date": second},
+    }
+    # one day cell and one month cell, no delete without removals
+    assert rollup_model.collection.requests == [
+        UpdateOne({"user_id": user_id, **_key("day", datetime(2024, 1, 10))}, update, upsert=True),
+        UpdateOne({"user_id": user_id, **_key("month", datetime(2024, 1, 1))}, update, upsert=True),
+    ]
+
+
+def test_apply_move_between_categories(rollup_model):
+    user_id = ObjectId()
+    date = datetime(2024, 2, 3, 12)
+    before = _transaction(7.5, date, "Food")
+    after = _transaction(7.5, date, "Travel")
+    rollup_model.apply(
+        user_id,
+        added=[RollupModel.transaction_cell(after)],
+        removed=[RollupModel.transaction_cell(before)]
+    )
+
+    requests = rollup_model.collection.requests
+    removed = {"$inc": {"sum": -7.5, "count": -1}}
+    assert UpdateOne({"user_id": user_id, **_key("day", datetime(2024, 2, 3), "Food")}, removed, upsert=False) in requests
+    assert UpdateOne({"user_id": user_id, **_key("month", datetime(2024, 2, 1), "Food")}, removed, upsert=False) in requests
+
+    # only the cells that lost a transaction are checked for emptiness
+    assert requests[-1] == DeleteMany({
+        "user_id": user_id,
+        "$or": [_key("day", datetime(2024, 2, 3), "Food"), _key("month", datetime(2024, 2, 1), "Food")],
+        "count": {"$lte": 0},
+    })
+
+
+def test_apply_add_and_remove_of_the_same_cell_cancel(rollup_model):
+    user_id = ObjectId()
+    cell = RollupModel.transaction_cell(_transaction(3.0, datetime(2024, 5, 1)))
+    rollup_model.apply(user_id, added=[cell], removed=[cell])
+
+    # the day and month cells are still upserted (extremes may widen),
+    # but no cell lost a transaction so nothing is checked for deletion
+    requests = rollup_model.collection.requests
+    assert len(requests) == 2
+    assert not any(isinstance(request, DeleteMany) for request in requests)
+
+
+def test_apply_without_cells_writes_nothing(rollup_model):
+    rollup_model.apply(ObjectId())
+    assert rollup_model.collection.requests is None
@@ -0,0 +1,107 @@
+"""
+StatementImporter parsing of CSV rows and OFX files (no MongoDB needed).
+"""
+from datetime import datetime
+
+import pytest
+
+from database.statement_importer import StatementImporter
+
+
+@pytest.fixture
+def importer():
+    # parsing does not touch the models
+    return StatementImporter(transaction_model=None, category_model=None)
+
+
+# ======================================
+# CSV
+# ======================================
+
+def test_csv_row_with_type_and_category(importer):
+    row = importer._parse_csv_row({
+        "date": "2024-01-05", "amount": "1,250.50", "type": " income ",
+        "category": " Salary ", "description": " January pay "
+    })
+    assert row == {
+        "type": "Income",
+        "category": "Salary",
+        "amount": 1250.5,
+        "date": datetime(2024, 1, 5),
+        "description": "January pay",
+    }
+
+
+def test_csv_row_type_from_amount_sign(importer):
+    expense = importer._parse_csv_row({"date": "05/01/2024", "amount": "-12.3"})
+    income = importer._parse_csv_row({"date": "2024/01/05", "amount": "40"})
+
+    assert expense["type"] == "Expense" and expense["amount"] == 12.3
+    assert income["type"] == "Income" and income["amount"] == 40.0
+    assert expense["category"] == income["category"] == "Others"
+    assert expense["date"] == income["date"] == datetime(2024, 1, 5)
+
+
+@pytest.mark.parametrize("row", [
+    {"date": "2024-01-05", "amount": "abc"},
+    {"date": "2024-01-05"},
+    {"date": "next tuesday", "amount": "10"},
+    {"amount": "10"},
+])
+def test_csv_row_errors(importer, row):
+    assert set(importer._parse_csv_row(row)) == {"_error"}
+
+
+# ======================================
+# OFX
+# ======================================
+
+SGML_OFX = """OFXHEADER:100
+<OFX>
+<BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>DEBIT
+<DTPOSTED>20240105120000[-5:EST]
+<TRNAMT>-42.10
+<FITID>1
+<NAME>Coffee Shop
+<MEMO>card 1234
+</STMTTRN>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240131
+<TRNAMT>3000.00
+<FITID>2
+<NAME>ACME payroll
+</STMTTRN>
+</BANKTRANLIST>
+</OFX>
+"""
+
+XML_OFX = (
+    "<OFX><STMTTRN><DTPOSTED>20240210</DTPOSTED><TRNAMT>-5</TRNAMT>"
+    "<NAME>Bus</NAME></STMTTRN></OFX>"
+)
+
+
+def test_ofx_sgml(importer):
+    rows = list(importer._parse_ofx(SGML_OFX.splitlines()))
+    assert rows == [
+        {"type": "Expense", "category": "Others", "amount": 42.1,
+         "date": datetime(2024, 1, 5), "description": "Coffee Shop card 1234"},
+        {"type": "Income", "category": "Others", "amount": 3000.0,
+         "date": datetime(2024, 1, 31), "description": "ACME payroll"},
+    ]
+
+
+def test_ofx_xml_on_one_line(importer):
+    rows = list(importer._parse_ofx([XML_OFX]))
+    assert rows == [
+        {"type": "Expense", "category": "Others", "amount": 5.0,
+         "date": datetime(2024, 2, 10), "description": "Bus"},
+    ]
+
+
+def test_ofx_invalid_transaction(importer):
+    lines = ["<STMTTRN>", "<FITID>9", "<TRNAMT>oops", "<DTPOSTED>20240101", "</STMTTRN>"]
+    assert list(importer._parse_ofx(lines)) == [{"_error": "Invalid OFX transaction 9"}]
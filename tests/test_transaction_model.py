@@ -0,0 +1,22 @@
+"""
+tokenize_text, the keywords behind description search (no MongoDB needed).
+"""
+from database.transaction_model import tokenize_text
+
+
+def test_lowercases_and_strips_accents():
+    assert tokenize_text("Café Latte x2") == ["cafe", "latte", "x2"]
+
+
+def test_splits_on_punctuation_and_keeps_first_occurrence_order():
+    assert tokenize_text("Uber*Trip - uber, TRIP; tip") == ["uber", "trip", "tip"]
+
+
+def test_empty_text():
+    assert tokenize_text(None) == []
+    assert tokenize_text("") == []
+    assert tokenize_text(" -- ") == []
+
+
+def test_regex_characters_are_not_tokens():
+    assert tokenize_text("a.*b (c+)") == ["a", "b", "c"]
@@ -0,0 +1,39 @@
+"""
+lttb_indices downsampling (no MongoDB needed).
+"""
+import numpy as np
+
+from analytics.visualize import lttb_indices
+
+
+def test_short_series_is_kept_whole():
+    x = np.arange(10, dtype=float)
+    assert list(lttb_indices(x, x, 10)) == list(range(10))
+    assert list(lttb_indices(x, x, 50)) == list(range(10))
+
+
+def test_threshold_below_three_keeps_everything():
+    x = np.arange(10, dtype=float)
+    assert len(lttb_indices(x, x, 2)) == 10
+
+
+def test_keeps_threshold_sorted_points_with_both_ends():
+    rng = np.random.default_rng(7)
+    x = np.sort(rng.uniform(0, 1000, 5000))
+    y = rng.normal(0, 1, 5000)
+
+    selected = lttb_indices(x, y, 200)
+
+    assert len(selected) == 200
+    assert selected[0] == 0 and selected[-1] == len(x) - 1
+    assert np.all(np.diff(selected) > 0)
+
+
+def test_spikes_survive_downsampling():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[[137, 512, 880]] = [50.0, -40.0, 75.0]
+
+    selected = set(lttb_indices(x, y, 30))
+
+    assert {137, 512, 880} <= selected
@@ -2,10 +2,14 @@ from .category_view import render_categories
 from .transaction_view import render_transactions
 from .user_view import render_user_profile
 from .homeview import render_dashboard
+from .budget_view import render_budgets
+from .debug_view import render_query_debug
 
 __all__ = [
     "render_categories",
     "render_transactions",
     "render_user_profile",
-    "render_dashboard"
+    "render_dashboard",
+    "render_budgets",
+    "render_query_debug"
 ]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import streamlit as st
+import config
+from datetime import datetime
+from utils import format_currency
+from database.budget_model import BudgetModel
+from database import CategoryModel
+from analytics.visualize import FinanceVisualizer
+
+
+def _render_alerts(budget_model: BudgetModel):
+    """Overspend alerts stored on write, no aggregation here"""
+    for alert in budget_model.get_alerts():
+        st.error(
+            f"🚨 {alert['category']} ({alert['period']}): spent "
+            f"{format_currency(alert['spent'])} of {format_currency(alert['amount'])}"
+        )
+
+
+def _render_budget_overview(budget_model: BudgetModel, visualizer_model: FinanceVisualizer):
+    st.subheader("Budget vs Actual")
+
+    reference_date = st.date_input("Period containing", value=datetime.now().date())
+    comparison = budget_model.get_budget_vs_actual(
+        datetime.combine(reference_date, datetime.min.time())
+    )
+
+    if comparison.empty:
+        st.info("No budgets yet, add one below")
+        return
+
+    for period in config.BUDGET_PERIODS:
+        rows = comparison[comparison["period"] == period]
+        if rows.empty:
+            continue
+
+        st.markdown(f"**{period}**")
+        fig = visualizer_model.plot_budget_comparison(
+            rows[["Category", "amount"]],
+            rows[["Category", "Total"]]
+        )
+        st.plotly_chart(fig, width='stretch')
+
+        st.dataframe(
+            rows[["Category", "amount", "Total", "Remaining", "Used (%)"]],
+            column_config={
+                "amount": st.column_config.NumberColumn("Budget", format="$%.2f"),
+                "Total": st.column_config.NumberColumn("Spent", format="$%.2f"),
+                "Remaining": st.column_config.NumberColumn(format="$%.2f"),
+                "Used (%)": st.column_config.ProgressColumn(min_value=0, max_value=100, format="%.1f%%"),
+            },
+            hide_index=True,
+            width='stretch'
+        )
+
+
+def _render_set_budget(budget_model: BudgetModel, category_model: CategoryModel):
+    st.subheader("Set budget")
+    categories = [cate["name"] for cate in category_model.get_categories_by_type("Expense")]
+
+    with st.form("set_budget", clear_on_submit=True):
+        col1, col2, col3 = st.columns([2, 1, 1])
+        with col1:
+            category = st.selectbox("Category", categories)
+        with col2:
+            period = st.selectbox("Period", config.BUDGET_PERIODS)
+        with col3:
+            amount = st.number_input("Amount", min_value=0.0, step=10.0, format="%.2f")
+
+        submitted = st.form_submit_button("Save", use_container_width=True)
+
+    if submitted:
+        try:
+            budget_model.set_budget(category=category, amount=amount, period=period)
+            st.success(f"✅ Budget for '{category}' saved")
+            st.rerun()
+        except ValueError as e:
+            st.error(f"❌ {e}")
+
+
+def _render_budget_list(budget_model: BudgetModel):
+    budgets = budget_model.get_budgets()
+    if not budgets:
+        return
+
+    st.subheader("Your budgets")
+    for budget in budgets:
+        col1, col2, col3 = st.columns([3, 2, 1])
+        with col1:
+            st.write(f"📌 {budget['category']}")
+        with col2:
+            st.caption(f"{format_currency(budget['amount'])} / {budget['period'].lower()}")
+        with col3:
+            if st.button("❌", key=f"del_budget_{budget['_id']}"):
+                budget_model.delete_budget(budget['category'], budget['period'])
+                st.rerun()
+
+
+# public function
+def render_budgets(budget_model: BudgetModel,
+                   category_model: CategoryModel,
+                   visualizer_model: FinanceVisualizer):
+    st.title("🎯 Budgets")
+
+    _render_alerts(budget_model)
+
+    _render_budget_overview(budget_model, visualizer_model)
+
+    st.divider()
+
+    _render_set_budget(budget_model, category_model)
+
+    _render_budget_list(budget_model)
@@ -1,8 +1,33 @@
 import streamlit as st
 import config
+from views.transaction_view import reset_loaded_transactions
+
+def _delete_category(category_model, item: dict):
+    """Confirm-delete callback, runs before the grid fragment reruns"""
+    try:
+        category_model.delete_category_safe(
+            category_type=item.get("type"),
+            category_name=item.get("name"),
+            strategy=st.session_state[f"strategy_{item['_id']}"]
+        )
+    except ValueError as e:
+        st.session_state.category_delete_error = str(e)
+        return
+
+    st.session_state.pending_category_delete = None
+    reset_loaded_transactions() # reassigned/deleted transactions
+    st.session_state.category_notice = f"✅ Deleted category '{item.get('name')}'"
+
 
 # function to render category list
+# (a fragment: deleting a category only reruns this grid,
+#  the category cache is invalidated so it reloads fresh data)
+@st.fragment
 def _render_category_list(category_model, category_type: str):
+    notice = st.session_state.pop("category_notice", None)
+    if notice:
+        st.toast(notice)
+
     st.subheader(f"{category_type} Categories")
     expense_lst = category_model.get_categories_by_type(category_type = category_type)
 
@@ -25,8 +50,12 @@ def _render_category_list(category_model, category_type: str):
 
                     with subcol_b:
                         
-                        delete_button = st.button("❌", key=f"del_{item['_id']}")
-                        if delete_button:
+                        if st.button("❌", key=f"del_{item['_id']}"):
+                            # remember it, the confirm widgets below rerun the fragment
+                            st.session_state.pending_category_delete = item['_id']
+                            st.session_state.category_delete_error = None
+
+                        if st.session_state.get("pending_category_delete") == item['_id']:
                             # Count affected transactions
                             trans_col = category_model.db_manager.get_collection(
                                 config.COLLECTIONS["transaction"]
@@ -39,28 +68,21 @@ def _render_category_list(category_model, category_type: str):
 
                             st.warning(f"⚠️ {affected} transactions will be affected")
 
-                            strategy = st.radio(
+                            st.radio(
                                 "Choose delete strategy",
                                 ["reassign", "cascade", "block"],
                                 key=f"strategy_{item['_id']}"
                             )
 
-                            confirm = st.button(
+                            st.button(
                                 "Confirm delete",
-                                key=f"confirm_{item['_id']}"
+                                key=f"confirm_{item['_id']}",
+                                on_click=_delete_category,
+                                args=(category_model, item)
                             )
 
-                            if confirm:
-                                try:
-                                    category_model.delete_category_safe(
-                                        category_type=item.get("type"),
-                                        category_name=item.get("name"),
-                                        strategy=strategy
-                                    )
-                                    st.success(f"✅ Deleted category '{item.get('name')}'")
-                                    st.rerun()
-                                except ValueError as e:
-                                    st.error(str(e))
+                            if st.session_state.get("category_delete_error"):
+                                st.error(st.session_state.category_delete_error)
 
 
 def _render_category_detail(category_model):
@@ -0,0 +1,52 @@
+from typing import Iterable
+
+import streamlit as st
+import pandas as pd
+from database.query_monitor import query_monitor, HISTOGRAM_BOUNDS_MS
+
+
+def render_query_debug(queries: Iterable[dict]):
+    """
+    Sidebar breakdown of the MongoDB commands of this rerun
+    (enabled with config.QUERY_DEBUG_PANEL).
+
+    Args:
+        queries: records collected by query_monitor for this rerun (bytes: slow queries only)
+    """
+    with st.sidebar.expander("🐢 Query debug", expanded=False):
+        total_ms = sum(query["duration_ms"] for query in queries)
+        st.caption(f"{len(queries)} queries, {total_ms:,.1f} ms in this rerun")
+
+        if queries:
+            df = pd.DataFrame(list(queries))
+            breakdown = (
+                df.groupby(["caller", "command"], as_index=False)
+                .agg(count=("duration_ms", "size"),
+                     total_ms=("duration_ms", "sum"),
+                     documents=("documents", "sum"),
+                     bytes=("bytes", "sum"))
+                .sort_values("total_ms", ascending=False)
+            )
+            st.dataframe(
+                breakdown,
+                column_config={"total_ms": st.column_config.NumberColumn(format="%.1f")},
+                hide_index=True,
+                width='stretch'
+            )
+
+        stats = query_monitor.snapshot()
+        if stats:
+            st.markdown("**Since process start**")
+            st.dataframe(
+                pd.DataFrame(stats)[["caller", "command", "count", "mean_ms", "max_ms", "histogram"]],
+                column_config={
+                    "mean_ms": st.column_config.NumberColumn(format="%.1f"),
+                    "max_ms": st.column_config.NumberColumn(format="%.1f"),
+                    "histogram": st.column_config.BarChartColumn(
+                        "latency",
+                        help=f"count per bucket, upper bounds {HISTOGRAM_BOUNDS_MS} ms, last bucket above"
+                    ),
+                },
+                hide_index=True,
+                width='stretch'
+            )
@@ -1,9 +1,11 @@
 import streamlit as st
 import pandas as pd
+from datetime import datetime
 from utils import format_currency, get_date_range_options
-from analytics.analyzer import FinanceAnalyzer
+from analytics.analyzer import FinanceAnalyzer, DashboardSnapshot
 from database import TransactionModel
 from analytics.visualize import FinanceVisualizer
+from database.transaction_exporter import TransactionExporter, EXPORT_FORMATS
 
 def render_dashboard(analyzer_model: FinanceAnalyzer, 
                     transaction_model: TransactionModel,
@@ -17,7 +19,20 @@ def render_dashboard(analyzer_model: FinanceAnalyzer,
         transaction_model: TransactionModel
     """
     st.title("📊 Financial Dashboard")
-    
+
+    _render_dashboard_panels(analyzer_model, visualizer_model)
+
+    # # Display recent transactions
+    # _render_recent_transactions(transaction_model)
+
+
+@st.fragment
+def _render_dashboard_panels(analyzer_model: FinanceAnalyzer,
+                             visualizer_model: FinanceVisualizer):
+    """
+    Date range + every panel, as a fragment: changing the range reloads
+    the snapshot and redraws the panels without rerunning the whole app.
+    """
     # Date range selector
     col1, _ = st.columns([2, 1])
     with col1:
@@ -30,38 +45,36 @@ def render_dashboard(analyzer_model: FinanceAnalyzer,
     date_ranges = get_date_range_options() #> return dictionary
     start_date, end_date = date_ranges[date_range_option]
 
+    # Compute every panel in one query, then render from the snapshot
+    snapshot = analyzer_model.get_dashboard_snapshot(start_date, end_date, months=6)
+
     # Display metrics section
-    _render_metrics(analyzer_model, start_date, end_date)
+    _render_metrics(snapshot)
     
     st.divider()
     
     # Display charts section
-    _render_charts(analyzer_model, visualizer_model, start_date, end_date)
-    
-    # # Display recent transactions
-    # _render_recent_transactions(transaction_model)
+    _render_charts(snapshot, visualizer_model)
 
+    # Transactions of the range, per-day min/max until zoomed in
+    _render_transaction_timeline(analyzer_model, visualizer_model, start_date, end_date)
 
-def _render_metrics(analyzer_model: FinanceAnalyzer, start_date, end_date):
+    # Download the tables behind the charts
+    _render_analytics_export(snapshot)
+
+
+def _render_metrics(snapshot: DashboardSnapshot):
     """Render the metrics cards at the top of dashboard"""
-    # Get statistics
-    if start_date and end_date:
-        total_expenses = analyzer_model.calculate_total_by_type("Expense", start_date, end_date)
-        total_income = analyzer_model.calculate_total_by_type("Income", start_date, end_date)
-    else:
-        total_expenses = analyzer_model.calculate_total_by_type("Expense")
-        total_income = analyzer_model.calculate_total_by_type("Income")
-    
-    net_balance = total_income - total_expenses
+    net_balance = snapshot.net_balance
     
     # Display metrics
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("💸 Total Expenses", format_currency(total_expenses))
+        st.metric("💸 Total Expenses", format_currency(snapshot.total_expenses))
     
     with col2:
-        st.metric("💰 Total Income", format_currency(total_income))
+        st.metric("💰 Total Income", format_currency(snapshot.total_income))
     
     with col3:
         delta_color = "normal" if net_balance >= 0 else "inverse"
@@ -70,21 +83,18 @@ def _render_metrics(analyzer_model: FinanceAnalyzer, start_date, end_date):
                   delta_color=delta_color)
     
     with col4:
-        daily_avg = analyzer_model.get_daily_average()
-        st.metric("📅 Daily Avg Expense", format_currency(daily_avg))
+        st.metric("📅 Daily Avg Expense", format_currency(snapshot.daily_average))
 
 
-def _render_charts(analyzer_model:FinanceAnalyzer, 
-                   visualizer_model:FinanceVisualizer, 
-                   start_date, 
-                   end_date):
+def _render_charts(snapshot: DashboardSnapshot, 
+                   visualizer_model:FinanceVisualizer):
     """Render the charts section with category and trend visualizations"""
     # Category charts
     col1, col2 = st.columns(2)
+    category_spending = snapshot.category_spending
 
     with col1:
         st.subheader("Spending by Category")
-        category_spending = analyzer_model.get_spending_by_category(start_date, end_date)
         if not category_spending.empty:
             fig = visualizer_model.plot_category_spending(category_spending)
             st.plotly_chart(fig, width='stretch') # embedded plotly chart into streamlit
@@ -101,13 +111,93 @@ def _render_charts(analyzer_model:FinanceAnalyzer,
     
     # Monthly trend
     st.subheader("Monthly Trend")
-    monthly_trend = analyzer_model.get_monthly_trend(months=6)
+    monthly_trend = snapshot.monthly_trend
     if not monthly_trend.empty:
         fig = visualizer_model.plot_monthly_trend(monthly_trend)
         st.plotly_chart(fig, width='stretch')
     else:
         st.info("No data available for monthly trend")
 
+    # Week x weekday spending
+    st.subheader("Spending Heatmap")
+    spending_heatmap = snapshot.spending_heatmap
+    if not spending_heatmap.empty:
+        fig = visualizer_model.plot_daily_spending_heatmap(spending_heatmap)
+        st.plotly_chart(fig, width='stretch')
+    else:
+        st.info("No expense data available for this period")
+
+
+@st.fragment
+def _render_transaction_timeline(analyzer_model: FinanceAnalyzer,
+                                 visualizer_model: FinanceVisualizer,
+                                 start_date, end_date):
+    """
+    Timeline of the selected range. Long ranges are drawn from per-day
+    min/max points, the zoom slider narrows the window until it holds at
+    most TIMELINE_MAX_POINTS transactions, which are then loaded and
+    drawn one by one (only this fragment reruns).
+    """
+    st.subheader("Transaction Timeline")
+    first_date, last_date = analyzer_model.get_date_bounds(start_date, end_date)
+    if first_date is None:
+        st.info("No transactions available for this period")
+        return
+
+    window_start, window_end = first_date.date(), last_date.date()
+    if window_start < window_end:
+        # keyed on the bounds: a new range starts unzoomed
+        window_start, window_end = st.slider(
+            "Zoom",
+            min_value=window_start,
+            max_value=window_end,
+            value=(window_start, window_end),
+            key=f"timeline_window_{window_start}_{window_end}"
+        )
+
+    df, full_resolution = analyzer_model.get_timeline(
+        datetime.combine(window_start, datetime.min.time()),
+        datetime.combine(window_end, datetime.max.time())
+    )
+    fig = visualizer_model.plot_transaction_timeline(df, full_resolution=full_resolution)
+    if fig is not None:
+        st.plotly_chart(fig, width='stretch')
+    else:
+        st.info("No transactions in this window")
+
+
+@st.fragment
+def _render_analytics_export(snapshot: DashboardSnapshot):
+    """Render downloads of the dashboard's analytics tables"""
+    with st.expander("⬇️ Export analytics", expanded=False):
+        export_format = st.radio(
+            "Format",
+            list(EXPORT_FORMATS.keys()),
+            horizontal=True,
+            key="analytics_export_format"
+        )
+        extension, mime = EXPORT_FORMATS[export_format]
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.download_button(
+                "⬇️ Spending by category",
+                data=lambda: TransactionExporter.export_frame(snapshot.category_spending, export_format),
+                file_name=f"spending_by_category.{extension}",
+                mime=mime,
+                disabled=snapshot.category_spending.empty,
+                use_container_width=True
+            )
+        with col2:
+            st.download_button(
+                "⬇️ Monthly trend",
+                data=lambda: TransactionExporter.export_frame(snapshot.monthly_trend, export_format),
+                file_name=f"monthly_trend.{extension}",
+                mime=mime,
+                disabled=snapshot.monthly_trend.empty,
+                use_container_width=True
+            )
+
 
 # # def _render_recent_transactions(transaction_model):
 #     """Render the recent transactions table"""
@@ -1,10 +1,13 @@
 import streamlit as st
 import config
 from datetime import date, datetime, timedelta
-import time
+from typing import Optional
+import pandas as pd
 from utils import handler_datetime, format_currency, format_date
 
 from database import TransactionModel
+from database.statement_importer import StatementImporter
+from database.transaction_exporter import TransactionExporter, EXPORT_FORMATS
 
 # ======================================
 # supporting functions
@@ -57,18 +60,50 @@ def _render_transaction_card(model: TransactionModel, item: dict):
         col_edit, col_delete, col_space = st.columns([1, 1, 3])
         
         with col_edit:
-            if st.button("✏️ Edit", key=f"edit_{item['_id']}", use_container_width=True):
-                st.session_state.editing_transaction = str(item['_id'])
-                st.rerun()
+            st.button("✏️ Edit", key=f"edit_{item['_id']}", use_container_width=True,
+                      on_click=_edit_selected, args=(str(item['_id']),))
         
         with col_delete:
-            if st.button("🗑️ Delete", key=f"delete_{item['_id']}", use_container_width=True, type="primary"):
-                if model.delete_transaction(str(item['_id'])):
-                    st.success("Transaction deleted successfully!")
-                    time.sleep(1)
-                    st.rerun()
-                else:
-                    st.error("Failed to delete transaction")
+            # runs before the list fragment reruns, so no extra rerun is needed
+            st.button("🗑️ Delete", key=f"delete_{item['_id']}", use_container_width=True, type="primary",
+                      on_click=_delete_transaction, args=(model, item['_id']))
+
+def _delete_transaction(model: TransactionModel, transaction_id):
+    """Delete one transaction and drop its card from the loaded pages (no refetch)."""
+    if model.delete_transaction(str(transaction_id)):
+        _forget_transactions({str(transaction_id)})
+        st.session_state.transaction_notice = "Transaction deleted successfully!"
+    else:
+        st.session_state.transaction_notice = "❌ Failed to delete transaction"
+
+def _patch_transactions(changes: dict[str, dict]):
+    """Apply saved edits to the loaded cards and table page (no refetch)."""
+    for loaded in st.session_state.loaded_transactions or []:
+        loaded.update(changes.get(str(loaded['_id']), {}))
+
+    frame = st.session_state.table_frame
+    if frame is not None:
+        frame = frame.copy()
+        for transaction_id, fields in changes.items():
+            rows = frame.index[frame['_id'] == transaction_id]
+            for field, value in fields.items():
+                if isinstance(frame[field].dtype, pd.CategoricalDtype):
+                    frame[field] = frame[field].astype(object)
+                frame.loc[rows, field] = value
+        st.session_state.table_frame = frame
+        st.session_state.table_version += 1
+
+def _forget_transactions(transaction_ids: set[str]):
+    """Patch the loaded cards and table page after a delete."""
+    if st.session_state.loaded_transactions:
+        st.session_state.loaded_transactions = [
+            loaded for loaded in st.session_state.loaded_transactions
+            if str(loaded['_id']) not in transaction_ids
+        ]
+    frame = st.session_state.table_frame
+    if frame is not None:
+        st.session_state.table_frame = frame[~frame['_id'].isin(transaction_ids)].reset_index(drop=True)
+        st.session_state.table_version += 1 # drop the selection of removed rows
 
 def _render_filters(model: TransactionModel):
     """Render filter controls."""
@@ -152,12 +187,14 @@ def _render_filters(model: TransactionModel):
                 filters['search_text'] = search_text
             
             st.session_state.active_filters = filters if filters else None
+            reset_loaded_transactions()
             st.rerun()
     
     with col_clear:
         if st.button("🔄 Clear Filters", use_container_width=True):
             st.session_state.active_filters = None
             st.session_state.show_filters = False
+            reset_loaded_transactions()
             st.rerun()
 
 # This function I left category_model untyped
@@ -166,6 +203,17 @@ def _render_filters(model: TransactionModel):
 def _render_create_transaction_form(transaction_model: TransactionModel, category_model):
     """Render create transaction form."""
     st.subheader("➕ Create New Transaction")
+
+    mode = st.radio(
+        "Entry mode",
+        ["Single", "Multiple rows"],
+        horizontal=True,
+        key="create_mode",
+        label_visibility="collapsed"
+    )
+    if mode == "Multiple rows":
+        _render_bulk_create_form(transaction_model, category_model)
+        return
     
     col1, col2 = st.columns(2)
     
@@ -232,6 +280,7 @@ def _render_create_transaction_form(transaction_model: TransactionModel, categor
             )
             
             if transaction_id:
+                reset_loaded_transactions()
                 st.success(f"✅ Transaction created successfully!")
                 st.session_state.show_create_form = False
                 st.rerun()
@@ -243,6 +292,167 @@ def _render_create_transaction_form(transaction_model: TransactionModel, categor
             st.session_state.show_create_form = False
             st.rerun()
 
+def _render_bulk_create_form(transaction_model: TransactionModel, category_model):
+    """Render a grid to enter many transactions, saved with one insert."""
+    st.caption("Add one row per transaction, then save them all at once.")
+
+    # a new key after each save gives a fresh, empty grid
+    editor_key = f"bulk_create_editor_{st.session_state.get('bulk_create_version', 0)}"
+    category_options = sorted({cate['name'] for cate in category_model.get_total()})
+
+    template = pd.DataFrame({
+        "type": pd.Series(["Expense"] * 5, dtype="object"),
+        "category": pd.Series([None] * 5, dtype="object"),
+        "amount": pd.Series([None] * 5, dtype="float"),
+        "date": pd.Series([date.today()] * 5, dtype="object"),
+        "description": pd.Series([""] * 5, dtype="object"),
+    })
+
+    edited = st.data_editor(
+        template,
+        num_rows="dynamic",
+        hide_index=True,
+        width='stretch',
+        key=editor_key,
+        column_config={
+            "type": st.column_config.SelectboxColumn("Type *", options=config.TRANSACTION_TYPES, required=True),
+            "category": st.column_config.SelectboxColumn("Category *", options=category_options),
+            "amount": st.column_config.NumberColumn("Amount *", min_value=0.01, format="%.2f"),
+            "date": st.column_config.DateColumn("Date *", format="DD-MM-YYYY"),
+            "description": st.column_config.TextColumn("Description"),
+        }
+    )
+
+    col_save, col_cancel = st.columns(2)
+
+    with col_save:
+        save = st.button("💾 Save all", use_container_width=True, type="primary", key="bulk_create_save")
+
+    with col_cancel:
+        if st.button("❌ Cancel", use_container_width=True, key="bulk_create_cancel"):
+            st.session_state.show_create_form = False
+            st.rerun()
+
+    if not save:
+        return
+
+    # NaN -> None, skip the rows left blank
+    rows = edited.astype(object).where(edited.notna(), None).to_dict("records")
+    filled = [
+        (number, row) for number, row in enumerate(rows, start=1)
+        if row['category'] or row['amount'] or row['description']
+    ]
+    row_numbers = [number for number, _ in filled]
+    rows = [row for _, row in filled]
+    if not rows:
+        st.warning("Nothing to save, fill at least one row")
+        return
+
+    errors = transaction_model.validate_transactions(rows)
+    if errors:
+        # nothing is saved until every row is valid
+        st.error(f"❌ {len(errors)} row(s) need fixing")
+        st.dataframe(
+            [{"Row": row_numbers[index], "Error": message} for index, message in errors.items()],
+            hide_index=True,
+            width='stretch'
+        )
+        return
+
+    now = datetime.now().time()
+    for row in rows:
+        row['date'] = datetime.combine(row['date'], now)
+        row['description'] = row['description'] or ""
+
+    inserted, write_errors = transaction_model.insert_transactions(rows)
+    if write_errors:
+        st.error(f"❌ {len(write_errors)} row(s) failed to save")
+        return
+
+    # one rerun for the whole batch
+    reset_loaded_transactions()
+    st.session_state.bulk_create_version = st.session_state.get('bulk_create_version', 0) + 1
+    st.session_state.show_create_form = False
+    st.toast(f"✅ {inserted} transaction(s) created")
+    st.rerun()
+
+def _render_import_form(transaction_model: TransactionModel, category_model):
+    """Render bulk statement import (CSV / OFX)."""
+    st.subheader("📥 Import Statement")
+    st.caption(
+        "CSV columns: date, amount and optionally type, category, description. "
+        "Without a type column, negative amounts are expenses."
+    )
+
+    uploaded_file = st.file_uploader(
+        "Statement file",
+        type=["csv", "ofx", "qfx"],
+        key="import_file"
+    )
+
+    if uploaded_file is not None and st.button("📥 Import", use_container_width=True, type="primary"):
+        importer = StatementImporter(transaction_model, category_model)
+        try:
+            with st.spinner("Importing transactions..."):
+                report = importer.import_file(uploaded_file, uploaded_file.name)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+
+        reset_loaded_transactions()
+        st.success(f"✅ Imported {report.inserted} transaction(s)")
+        if report.errors:
+            st.warning(f"⚠️ {report.failed} row(s) skipped")
+            st.dataframe(
+                [{"Row": row, "Error": message} for row, message in report.errors],
+                hide_index=True,
+                width='stretch'
+            )
+
+def _prepare_export(transaction_model: TransactionModel, filters: Optional[dict]):
+    """Count the rows to export for these filters (kept until the filters change)."""
+    st.session_state.export_prepared = (filters, transaction_model.count_transactions(filters))
+
+
+def _render_export(transaction_model: TransactionModel):
+    """Render download of the (filtered) transactions as CSV or Parquet."""
+    with st.expander("⬇️ Export transactions", expanded=False):
+        export_format = st.radio(
+            "Format",
+            list(EXPORT_FORMATS.keys()),
+            horizontal=True,
+            key="export_format"
+        )
+        extension, mime = EXPORT_FORMATS[export_format]
+        filters = st.session_state.active_filters # same filters as the list
+
+        # the file is built in memory, so very large exports are refused;
+        # rows are only counted on request, not on every rerun
+        prepared = st.session_state.get('export_prepared')
+        if prepared is None or prepared[0] != filters:
+            st.button("📦 Prepare export", use_container_width=True, key="export_prepare",
+                      on_click=_prepare_export, args=(transaction_model, filters))
+            return
+
+        rows = prepared[1]
+        too_large = rows > config.EXPORT_MAX_ROWS
+        if too_large:
+            st.warning(f"{rows:,} transactions match, exports are limited to "
+                       f"{config.EXPORT_MAX_ROWS:,}. Narrow the date range with the filters.")
+        else:
+            st.caption(f"{rows:,} transaction(s) to export")
+
+        # the file is only built when the button is clicked
+        st.download_button(
+            "⬇️ Download",
+            data=lambda: TransactionExporter(transaction_model).export(export_format, filters),
+            file_name=f"transactions.{extension}",
+            mime=mime,
+            disabled=too_large,
+            use_container_width=True,
+            key="export_download"
+        )
+
 def initialize_session_state():
     """Initialize session state variables for transaction view."""
     if 'show_filters' not in st.session_state:
@@ -251,15 +461,327 @@ def initialize_session_state():
         st.session_state.active_filters = None
     if 'show_create_form' not in st.session_state:
         st.session_state.show_create_form = False
+    if 'show_import_form' not in st.session_state:
+        st.session_state.show_import_form = False
+    if 'editing_transaction' not in st.session_state:
+        st.session_state.editing_transaction = None
+    if 'loaded_transactions' not in st.session_state:
+        reset_loaded_transactions()
+
+
+def reset_loaded_transactions():
+    """Drop the loaded pages so the list starts again from the first page."""
+    st.session_state.loaded_transactions = None # None = nothing fetched yet
+    st.session_state.transactions_cursor = None
+
+    # table view: current page and the cursors of the pages before it
+    st.session_state.table_frame = None
+    st.session_state.table_cursors = [None]
+    st.session_state.table_next_cursor = None
+    st.session_state.table_version = st.session_state.get('table_version', 0) + 1
 
 # ======================================
 # function render list of transactions
 # ======================================
+def _load_next_page(transaction_model: TransactionModel):
+    """Fetch the next page after the cursor and append it to the loaded list."""
+    filters = st.session_state.active_filters
+    if (filters or {}).get('search_text'):
+        # best keyword matches first
+        transactions, cursor = transaction_model.search_transactions(
+            search_text=filters['search_text'],
+            advanced_filters=filters,
+            page_size=config.TRANSACTION_PAGE_SIZE,
+            after=st.session_state.transactions_cursor
+        )
+    else:
+        transactions, cursor = transaction_model.get_transactions_page(
+            advanced_filters=filters,
+            page_size=config.TRANSACTION_PAGE_SIZE,
+            after=st.session_state.transactions_cursor
+        )
+    st.session_state.loaded_transactions = (st.session_state.loaded_transactions or []) + transactions
+    st.session_state.transactions_cursor = cursor
+
+
+# table view: one page of rows at a time, so render cost is bounded
+# by the page size (table_page_size) whatever the size of the history
+def _load_table_page(transaction_model: TransactionModel):
+    """Fetch the table page starting at the last cursor of table_cursors."""
+    filters = st.session_state.active_filters
+    page_size = st.session_state.get('table_page_size', config.TRANSACTION_TABLE_PAGE_SIZE)
+    if (filters or {}).get('search_text'):
+        # relevance results, paged on (score, date, _id)
+        results, cursor = transaction_model.search_transactions(
+            search_text=filters['search_text'],
+            advanced_filters=filters,
+            page_size=page_size,
+            after=st.session_state.table_cursors[-1]
+        )
+        frame = pd.DataFrame(results, columns=["_id", *TransactionModel.LIST_FIELDS])
+        frame['_id'] = frame['_id'].astype(str)
+    else:
+        frame, cursor = transaction_model.get_transactions_page_frame(
+            advanced_filters=filters,
+            page_size=page_size,
+            after=st.session_state.table_cursors[-1]
+        )
+    st.session_state.table_frame = frame
+    st.session_state.table_next_cursor = cursor
+    st.session_state.table_version += 1
+
+
+def _table_next_page(transaction_model: TransactionModel):
+    st.session_state.table_cursors.append(st.session_state.table_next_cursor)
+    _load_table_page(transaction_model)
+
+
+def _table_previous_page(transaction_model: TransactionModel):
+    st.session_state.table_cursors.pop()
+    _load_table_page(transaction_model)
+
+
+def _edit_selected(transaction_id: str):
+    st.session_state.editing_transaction = transaction_id
+
+
+def _delete_selected(transaction_model: TransactionModel, transaction_ids: list[str]):
+    # one delete_many for the whole selection
+    deleted = transaction_model.delete_transactions(transaction_ids)
+    _forget_transactions(set(transaction_ids))
+    st.session_state.transaction_notice = f"🗑️ Deleted {deleted} transaction(s)"
+
+
+# ======================================
+# editing: one transaction (form) or a whole page (grid)
+# ======================================
+def _save_edited_transaction(transaction_model: TransactionModel, transaction_id: str):
+    """Submit callback of the edit form, values come from the widget keys."""
+    changes = {
+        "type": st.session_state.edit_type,
+        "category": st.session_state.edit_category,
+        "amount": st.session_state.edit_amount,
+        "date": datetime.combine(st.session_state.edit_date, st.session_state.edit_time),
+        "description": st.session_state.edit_description,
+    }
+    updated, errors = transaction_model.update_transactions({transaction_id: changes})
+    if errors:
+        st.session_state.transaction_notice = f"❌ {errors[transaction_id]}"
+        return
+
+    _patch_transactions({transaction_id: changes})
+    st.session_state.editing_transaction = None
+    st.session_state.transaction_notice = "✅ Transaction updated"
+
+
+def _render_edit_transaction_form(transaction_model: TransactionModel):
+    """Edit the transaction picked with an Edit button (editing_transaction)."""
+    transaction_id = st.session_state.editing_transaction
+    item = transaction_model.get_transaction_by_id(transaction_id)
+    if item is None:
+        st.session_state.editing_transaction = None
+        return
+
+    with st.form("edit_transaction"):
+        st.subheader("✏️ Edit Transaction")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            transaction_type = st.selectbox(
+                "Type *",
+                options=config.TRANSACTION_TYPES,
+                index=config.TRANSACTION_TYPES.index(item['type']),
+                key="edit_type"
+            )
+            st.number_input("Amount *", min_value=0.01, value=float(item['amount']),
+                            format="%.2f", key="edit_amount")
+            st.date_input("Date *", value=item['date'].date(), key="edit_date")
+            st.time_input("Time", value=item['date'].time(), key="edit_time")
+
+        with col2:
+            # every category, the pair is validated on save
+            category_options = sorted({cate['name'] for cate in transaction_model.category_model.get_total()})
+            st.selectbox(
+                "Category *",
+                options=category_options,
+                index=category_options.index(item['category']) if item['category'] in category_options else 0,
+                key="edit_category"
+            )
+            st.text_area("Description", value=item.get('description', ""), key="edit_description")
+
+        col_save, col_cancel = st.columns(2)
+        with col_save:
+            st.form_submit_button("💾 Save", use_container_width=True, type="primary",
+                                  on_click=_save_edited_transaction, args=(transaction_model, transaction_id))
+        with col_cancel:
+            st.form_submit_button("❌ Cancel", use_container_width=True,
+                                  on_click=_edit_selected, args=(None,))
+
+
+def _diff_rows(original: pd.DataFrame, edited_rows: dict) -> dict[str, dict]:
+    """
+    {transaction id: {field: new value}} from the grid's edited_rows
+    ({row position: {column: value}}), cells set back to their value dropped
+    """
+    changes = {}
+    for position, cells in edited_rows.items():
+        row = original.iloc[int(position)]
+        for field, value in cells.items():
+            if field not in TransactionModel.EDITABLE_FIELDS or value is None:
+                continue
+            if field == "date":
+                value = pd.Timestamp(value).to_pydatetime()
+            elif field == "amount":
+                value = float(value)
+            if value != row[field]:
+                changes.setdefault(row['_id'], {})[field] = value
+    return changes
+
+
+def _save_grid(transaction_model: TransactionModel, editor_key: str):
+    """Save button callback of the grid: every change in one bulk_write."""
+    # edits committed in the same interaction as the click are already in the widget state
+    changes = _diff_rows(st.session_state.table_frame, st.session_state[editor_key]["edited_rows"])
+    if not changes:
+        st.session_state.transaction_notice = "Nothing changed"
+        return
+
+    updated, errors = transaction_model.update_transactions(changes)
+    _patch_transactions({
+        transaction_id: fields for transaction_id, fields in changes.items()
+        if transaction_id not in errors
+    })
+    st.session_state.grid_errors = errors
+    st.session_state.transaction_notice = f"✅ Updated {updated} transaction(s)"
+
+
+def _render_transaction_grid(transaction_model: TransactionModel, frame: pd.DataFrame):
+    """Editable grid of the current table page, saved with one bulk_write."""
+    original = frame.astype({"type": object, "category": object})
+    category_options = sorted({cate['name'] for cate in transaction_model.category_model.get_total()})
+
+    editor_key = f"transactions_grid_{st.session_state.table_version}"
+    st.data_editor(
+        original,
+        key=editor_key,
+        num_rows="fixed",
+        hide_index=True,
+        width='stretch',
+        column_order=TransactionModel.EDITABLE_FIELDS,
+        column_config={
+            "date": st.column_config.DatetimeColumn("Date", format="YYYY-MM-DD HH:mm", required=True),
+            "type": st.column_config.SelectboxColumn("Type", options=config.TRANSACTION_TYPES, required=True),
+            "category": st.column_config.SelectboxColumn("Category", options=category_options, required=True),
+            "amount": st.column_config.NumberColumn("Amount", min_value=0.01, format="$%.2f", required=True),
+            "description": "Description",
+        }
+    )
+
+    for transaction_id, message in (st.session_state.get("grid_errors") or {}).items():
+        st.error(f"❌ {transaction_id}: {message}")
+
+    st.button("💾 Save changes", use_container_width=True, type="primary", key="grid_save",
+              on_click=_save_grid, args=(transaction_model, editor_key))
+
+
+def _render_transaction_table(transaction_model: TransactionModel):
+    if st.session_state.table_frame is None:
+        _load_table_page(transaction_model)
+
+    frame = st.session_state.table_frame
+    if frame.empty:
+        st.info("No transactions found. Add your first transaction to get started!")
+        return
+
+    if st.toggle("✏️ Edit rows", key="table_grid_mode"):
+        _render_transaction_grid(transaction_model, frame)
+        _render_table_pager(transaction_model, frame)
+        return
+
+    event = st.dataframe(
+        frame,
+        key=f"transactions_table_{st.session_state.table_version}",
+        on_select="rerun", # only reruns this fragment
+        selection_mode="multi-row",
+        hide_index=True,
+        width='stretch',
+        column_order=TransactionModel.LIST_FIELDS,
+        column_config={
+            "date": st.column_config.DatetimeColumn("Date", format="YYYY-MM-DD"),
+            "type": "Type",
+            "category": "Category",
+            "amount": st.column_config.NumberColumn("Amount", format="$%.2f"),
+            "description": "Description",
+        }
+    )
+    selected_ids = frame.iloc[event.selection.rows]['_id'].tolist()
+
+    col_edit, col_delete = st.columns(2)
+    with col_edit:
+        st.button("✏️ Edit", use_container_width=True, key="table_edit",
+                  disabled=len(selected_ids) != 1,
+                  on_click=_edit_selected, args=(selected_ids[0] if selected_ids else None,))
+    with col_delete:
+        st.button(f"🗑️ Delete ({len(selected_ids)})", use_container_width=True, key="table_delete",
+                  type="primary", disabled=not selected_ids,
+                  on_click=_delete_selected, args=(transaction_model, selected_ids))
+    _render_table_pager(transaction_model, frame)
+
+
+def _change_table_page_size():
+    # back to the first page with the new size
+    st.session_state.table_frame = None
+    st.session_state.table_cursors = [None]
+    st.session_state.table_next_cursor = None
+
+
+def _render_table_pager(transaction_model: TransactionModel, frame: pd.DataFrame):
+    col_previous, col_next, col_size = st.columns(3)
+    with col_size:
+        st.selectbox("Rows per page", options=config.TRANSACTION_TABLE_PAGE_SIZES,
+                     key="table_page_size", label_visibility="collapsed",
+                     on_change=_change_table_page_size)
+    with col_previous:
+        st.button("⬅️ Previous", use_container_width=True, key="table_previous",
+                  disabled=len(st.session_state.table_cursors) <= 1,
+                  on_click=_table_previous_page, args=(transaction_model,))
+    with col_next:
+        st.button("➡️ Next", use_container_width=True, key="table_next",
+                  disabled=st.session_state.table_next_cursor is None,
+                  on_click=_table_next_page, args=(transaction_model,))
+
+    st.caption(f"Page {len(st.session_state.table_cursors)} · {len(frame)} row(s)")
+
+
+@st.fragment
 def _render_list_transaction(transaction_model: TransactionModel):
-    # Fetch transactions with load more approach
-    transactions = transaction_model.get_transactions(
-        advanced_filters=st.session_state.active_filters
+    # a fragment: load more / delete only rerun this list, not the whole app
+    # (their callbacks patch the loaded pages before it reruns)
+    notice = st.session_state.pop("transaction_notice", None)
+    if notice:
+        st.toast(notice)
+
+    if st.session_state.editing_transaction:
+        _render_edit_transaction_form(transaction_model)
+
+    view_mode = st.radio(
+        "View",
+        ["Table", "Cards"],
+        horizontal=True,
+        key="transactions_view_mode",
+        label_visibility="collapsed"
     )
+    if view_mode == "Table":
+        _render_transaction_table(transaction_model)
+        return
+
+    # Fetch transactions with load more approach:
+    # only the first page on a fresh list, later pages on demand
+    # (a description search pages through the best matches instead)
+    if st.session_state.loaded_transactions is None:
+        _load_next_page(transaction_model)
+
+    transactions = st.session_state.loaded_transactions
         
     # Display transactions
     if not transactions:
@@ -268,6 +790,11 @@ def _render_list_transaction(transaction_model: TransactionModel):
         for item in transactions:
             _render_transaction_card(transaction_model, item)
 
+        # cursor is None once the last page is loaded
+        if st.session_state.transactions_cursor is not None:
+            st.button("⬇️ Load more", use_container_width=True, key="load_more_transactions",
+                      on_click=_load_next_page, args=(transaction_model,))
+
 
 # ======================================
 # function render main view
@@ -284,7 +811,7 @@ def render_transactions(transaction_model, category_model):
         return # exist the function early
     
     # Header with CREATE button
-    col_title, col_create, col_filter = st.columns([3, 1, 1])
+    col_title, col_create, col_import, col_filter = st.columns([3, 1, 1, 1])
     
     with col_title:
         st.title("📊 Transactions")
@@ -294,6 +821,11 @@ def render_transactions(transaction_model, category_model):
             st.session_state.show_create_form = not st.session_state.show_create_form # negate the boolean value
             st.rerun()
     
+    with col_import:
+        if st.button("📥 IMPORT", use_container_width=True):
+            st.session_state.show_import_form = not st.session_state.show_import_form # negate the boolean value
+            st.rerun()
+    
     with col_filter:
         if st.button("🔍 Filters", use_container_width=True):
             st.session_state.show_filters = not st.session_state.show_filters # negate the boolean value
@@ -305,6 +837,12 @@ def render_transactions(transaction_model, category_model):
             _render_create_transaction_form(transaction_model, category_model)
         st.divider()
     
+    # Show import form if toggled
+    if st.session_state.show_import_form:
+        with st.container():
+            _render_import_form(transaction_model, category_model)
+        st.divider()
+    
     # Show filters if toggled
     if st.session_state.show_filters:
         with st.container():
@@ -316,5 +854,8 @@ def render_transactions(transaction_model, category_model):
         filter_count = len(st.session_state.active_filters)
         st.info(f"🔍 {filter_count} filter(s) active")
 
+    # Export (uses the active filters)
+    _render_export(transaction_model)
+
     # Render list of transactions
     _render_list_transaction(transaction_model)
\ No newline at end of file